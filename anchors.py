@@ -1,11 +1,64 @@
 import re
+from typing import Iterator
+
+
+class AnchorTables:
+    """
+    Lookups derived from the registered styles, built once and rebuilt only when a style is registered.
+    """
+
+    def __init__(self, anchors: dict[str, tuple[str, str]]) -> None:
+        self.anchors: dict[str, tuple[str, str]] = dict(anchors)
+        self.styles: list[str] = list(anchors)
+        self.open_anchors: frozenset[str] = frozenset(start for start, _ in anchors.values())
+        self.close_anchors: frozenset[str] = frozenset(end for _, end in anchors.values())
+        self.style_from_anchor: dict[str, str] = {a: style for style, pair in anchors.items() for a in pair}
+        self.pattern: re.Pattern = re.compile(f'[{re.escape("".join(self.style_from_anchor))}]')
+
+
+_registered_anchors: dict[str, tuple[str, str]] = {
+    'italic': ('\uE000', '\uE001'),
+    'bold': ('\uE002', '\uE003')
+}
+
+_tables: AnchorTables | None = None
+
+
+def get_tables() -> AnchorTables:
+    global _tables
+
+    if _tables is None:
+        _tables = AnchorTables(_registered_anchors)
+
+    return _tables
+
+
+def register_style(style: str) -> tuple[str, str]:
+    """
+    Gives a new text style the next free pair of anchors in the Private Use Area. Exporters only format styles
+    registered with styles.register_text_style, which calls this.
+    """
+
+    global _tables
+
+    if style in _registered_anchors:
+        raise ValueError(f'style: {style} is already registered')
+
+    first, last = available_anchor_range()
+    used: set[str] = set(get_tables().style_from_anchor)
+    start: int = max(map(ord, used), default=ord(first) - 1) + 1
+
+    if start + 1 > ord(last):
+        raise ValueError('no anchors left to register a style with')
+
+    _registered_anchors[style] = (chr(start), chr(start + 1))
+    _tables = None
+
+    return _registered_anchors[style]
 
 
 def get_anchors_dict() -> dict[str, tuple[str, str]]:
-    return {
-        'italic': ('\uE000', '\uE001'),
-        'bold': ('\uE002', '\uE003')
-    }
+    return dict(get_tables().anchors)
 
 
 def available_anchor_range() -> tuple[str, str]:
@@ -13,15 +66,15 @@ def available_anchor_range() -> tuple[str, str]:
 
 
 def get_styles() -> list[str]:
-    return list(get_anchors_dict().keys())
+    return list(get_tables().styles)
 
 
 def get_anchor_pairs() -> list[tuple[str, str]]:
-    return list(get_anchors_dict().values())
+    return list(get_tables().anchors.values())
 
 
 def get_style_anchors(style: str) -> tuple[str, str]:
-    return get_anchors_dict()[style]
+    return get_tables().anchors[style]
 
 
 def get_open_anchor(style: str) -> str:
@@ -29,15 +82,15 @@ def get_open_anchor(style: str) -> str:
 
 
 def get_anchors() -> str:
-    return ''.join([a for v in get_anchors_dict().values() for a in v])
+    return ''.join(get_tables().style_from_anchor)
 
 
 def get_all_anchors_pattern() -> str:
-    return f'[{get_anchors()}]'
+    return get_tables().pattern.pattern
 
 
 def remove_anchors(text: str) -> str:
-    return re.sub(get_all_anchors_pattern(), '', text)
+    return get_tables().pattern.sub('', text)
 
 
 def has_style(text: str, style: str) -> bool:
@@ -50,7 +103,7 @@ def wrap_text_in_style(text: str, style: str) -> str:
 
 
 def split_on_style(text: str) -> tuple:
-    match = re.search(get_all_anchors_pattern(), text)
+    match = get_tables().pattern.search(text)
 
     if not match:
         return ()
@@ -60,13 +113,49 @@ def split_on_style(text: str) -> tuple:
     return text[index], text[:index], text[index + 1:]
 
 
+def iter_runs(text: str) -> Iterator[tuple[str, frozenset[str]]]:
+    """
+    Splits text on its anchors in a single scan.
+
+    :return: each non-empty stretch of text with the styles active over it
+    """
+
+    tables: AnchorTables = get_tables()
+    styles: set[str] = set()
+    active: frozenset[str] = frozenset()
+    last: int = 0
+
+    for match in tables.pattern.finditer(text):
+        index: int = match.start()
+
+        if index > last:
+            yield text[last:index], active
+
+        anchor: str = match.group()
+
+        if anchor in tables.open_anchors:
+            styles.add(tables.style_from_anchor[anchor])
+        else:
+            styles.remove(tables.style_from_anchor[anchor])
+
+        active = frozenset(styles)
+        last = index + 1
+
+    if last < len(text):
+        yield text[last:], active
+
+
+def is_anchor(char: str) -> bool:
+    return char in get_tables().style_from_anchor
+
+
 def is_open_anchor(anchor: str) -> bool:
-    return anchor in {start for start, _ in get_anchor_pairs()}
+    return anchor in get_tables().open_anchors
 
 
 def is_close_anchor(anchor: str) -> bool:
-    return anchor in {end for _, end in get_anchor_pairs()}
+    return anchor in get_tables().close_anchors
 
 
 def get_style_from_anchor(anchor: str) -> str:
-    return {v: k for k, vals in get_anchors_dict().items() for v in vals}[anchor]
+    return get_tables().style_from_anchor[anchor]
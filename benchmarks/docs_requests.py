@@ -0,0 +1,66 @@
+"""
+Times building the Google Docs batchUpdate requests for a synthetic document.
+
+    python benchmarks/docs_requests.py [--paragraphs N] [--repeat N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from anchors import wrap_text_in_style  # noqa: E402
+from docrun import DocRun, get_runs  # noqa: E402
+from output.docs.send import build_requests  # noqa: E402
+from richtext import RichText, RichTextDocument  # noqa: E402
+
+# astral characters included, as they are what makes UTF-16 offsets differ from string indexes
+WORDS: list[str] = ['the', 'land', 'league', 'tenants', 'Mayo', 'rent', 'Éire', '“fair”', '𝔄ncient', '—', '🍀']
+
+PARAGRAPH_STYLES: list[set[str]] = [set(), set(), set(), {'blockquote'}, {'heading1'}, {'heading2'}, {'align-right'},
+                                    {'blockquote', 'align-centre'}]
+
+
+def make_document(paragraphs: int, seed: int = 0) -> RichTextDocument:
+    rand = random.Random(seed)
+    texts: list[RichText] = []
+
+    for _ in range(paragraphs):
+        words: list[str] = [rand.choice(WORDS) for _ in range(rand.randint(5, 60))]
+
+        for i in rand.sample(range(len(words)), k=min(3, len(words))):
+            words[i] = wrap_text_in_style(words[i], rand.choice(['italic', 'bold']))
+
+        texts.append(RichText(None, ' '.join(words), set(rand.choice(PARAGRAPH_STYLES))))
+
+    return RichTextDocument(texts)
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--paragraphs', type=int, default=100_000)
+    arguments.add_argument('--repeat', type=int, default=3)
+    args = arguments.parse_args()
+
+    document: RichTextDocument = make_document(args.paragraphs)
+
+    start: float = time.perf_counter()
+    runs: list[DocRun] = get_runs(document)
+    print(f'{args.paragraphs} paragraphs, {len(runs)} runs in {time.perf_counter() - start:.3f}s')
+
+    best: float | None = None
+
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        requests: list[dict] = build_requests(runs)
+        elapsed: float = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f'{len(requests)} requests in {best:.3f}s (best of {args.repeat})')
+
+
+if __name__ == '__main__':
+    main()
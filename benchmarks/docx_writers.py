@@ -0,0 +1,67 @@
+"""
+Times the streaming DOCX writer against the python-docx one on a synthetic document.
+
+    python benchmarks/docx_writers.py [--paragraphs N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from anchors import wrap_text_in_style  # noqa: E402
+from output.docx import to_docx, to_docx_stream  # noqa: E402
+from richtext import RichText, RichTextDocument  # noqa: E402
+
+WORDS: list[str] = ['the', 'land', 'league', 'tenants', 'Mayo', 'rent', 'landlords’', '“fair”', '&', '<b>', '—']
+
+PARAGRAPH_STYLES: list[set[str]] = [set(), set(), set(), {'blockquote'}, {'heading1'}, {'heading2'}, {'align-right'},
+                                    {'blockquote', 'align-centre'}]
+
+
+def make_document(paragraphs: int, seed: int = 0) -> RichTextDocument:
+    rand = random.Random(seed)
+    texts: list[RichText] = []
+
+    for _ in range(paragraphs):
+        words: list[str] = [rand.choice(WORDS) for _ in range(rand.randint(5, 60))]
+
+        for i in rand.sample(range(len(words)), k=min(3, len(words))):
+            words[i] = wrap_text_in_style(words[i], rand.choice(['italic', 'bold']))
+
+        texts.append(RichText(None, ' '.join(words), set(rand.choice(PARAGRAPH_STYLES))))
+
+    return RichTextDocument(texts)
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--paragraphs', type=int, default=10_000)
+    args = arguments.parse_args()
+
+    document: RichTextDocument = make_document(args.paragraphs)
+    metadata: dict[str, str] = {'title': 'benchmark', 'publication': '', 'date': ''}
+
+    print(f'{args.paragraphs} paragraphs')
+
+    # the writers export to ./export, kept out of the working directory
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        for name, writer in (('python-docx', to_docx), ('docx-stream', to_docx_stream)):
+            document.invalidate()
+            start: float = time.perf_counter()
+            writer(document, metadata)
+            elapsed: float = time.perf_counter() - start
+            size: int = Path('export', 'benchmark.docx').stat().st_size
+
+            print(f'{name:<12} {elapsed:8.3f}s {size / 1024:10.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
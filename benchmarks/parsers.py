@@ -0,0 +1,55 @@
+"""
+Times building a document from HTML with each parser.
+
+    python benchmarks/parsers.py [--repeat N] [file.html ...]
+
+Without files, the test fixtures are used.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from input.get import adaptor, get_body_generic  # noqa: E402
+from input.parser import get_parsers, parse_html  # noqa: E402
+
+FIXTURES: Path = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'html'
+
+
+def build(content: bytes, parser: str) -> None:
+    adaptor(get_body_generic(parse_html(content, parser)))
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('files', nargs='*', type=Path)
+    arguments.add_argument('--repeat', type=int, default=20)
+    args = arguments.parse_args()
+
+    files: list[Path] = args.files or sorted(FIXTURES.glob('*.html'))
+    contents: list[bytes] = [file.read_bytes() for file in files]
+    size: int = sum(map(len, contents))
+
+    print(f'{len(contents)} files, {size / 1024:.1f} KiB, {args.repeat} repeats')
+
+    baseline: float | None = None
+
+    for parser in get_parsers():
+        start: float = time.perf_counter()
+
+        for _ in range(args.repeat):
+            for content in contents:
+                build(content, parser)
+
+        elapsed: float = time.perf_counter() - start
+        baseline = baseline or elapsed
+
+        print(f'{parser:<12} {elapsed:8.3f}s {size * args.repeat / elapsed / 2 ** 20:8.2f} MiB/s '
+              f'{baseline / elapsed:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
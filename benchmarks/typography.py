@@ -0,0 +1,69 @@
+"""
+Times adapting a synthetic corpus into paragraphs with smart typography.
+
+    python benchmarks/typography.py [--paragraphs N] [--repeat N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from anchors import wrap_text_in_style  # noqa: E402
+from docrun import adapt_into_paragraphs_from_rich_text  # noqa: E402
+from richtext import RichText, RichTextDocument  # noqa: E402
+
+# straight quotes in every position the typography has to decide, plus dashes and ellipses
+WORDS: list[str] = ['the', 'land', 'league', "isn't", "'tis", "'98", "'single'", '"double"', "tenants'", '—"quoted"',
+                    '--', '...', 'rent', 'Mayo', '(\'aside\')', 'o\'clock']
+
+
+def make_document(paragraphs: int, seed: int = 0) -> RichTextDocument:
+    rand = random.Random(seed)
+    texts: list[RichText] = []
+
+    for _ in range(paragraphs):
+        words: list[str] = [rand.choice(WORDS) for _ in range(rand.randint(10, 200))]
+
+        for i in rand.sample(range(len(words)), k=min(4, len(words))):
+            words[i] = wrap_text_in_style(words[i], rand.choice(['italic', 'bold']))
+
+        texts.append(RichText(None, ' '.join(words), set()))
+
+    return RichTextDocument(texts)
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--paragraphs', type=int, default=50_000)
+    arguments.add_argument('--repeat', type=int, default=3)
+    args = arguments.parse_args()
+
+    document: RichTextDocument = make_document(args.paragraphs)
+    size: int = sum(len(rt.text) for rt in document.texts)
+
+    print(f'{args.paragraphs} paragraphs, {size / 1e6:.1f}M characters')
+
+    options: dict[str, dict[str, bool]] = {
+        'plain': {},
+        'curved quotes': {'curved_quotes': True},
+        'all typography': {'curved_quotes': True, 'dashes': True, 'ellipses': True}
+    }
+
+    for name, flags in options.items():
+        best: float | None = None
+
+        for _ in range(args.repeat):
+            start: float = time.perf_counter()
+            adapt_into_paragraphs_from_rich_text(document, **flags)
+            elapsed: float = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        print(f'{name:<15} {best:8.3f}s {size / best / 1e6:8.2f}M chars/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Times serialising a synthetic document to WordPress block markup.
+
+    python benchmarks/wordpress_blocks.py [--paragraphs N] [--repeat N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from anchors import wrap_text_in_style  # noqa: E402
+from output.wordpress.build import build_html_from_document  # noqa: E402
+from richtext import RichText, RichTextDocument  # noqa: E402
+
+WORDS: list[str] = ['the', 'land', 'league', 'tenants', 'Mayo', 'rent', 'landlords’', '“fair”', '&', '1 > 0', '—']
+
+# headings and quotes become blocks of their own, and consecutive quoted texts share one
+PARAGRAPH_STYLES: list[set[str]] = [set(), set(), set(), {'blockquote'}, {'blockquote'}, {'heading2'}, {'heading3'},
+                                    {'align-right'}, {'align-centre'}]
+
+
+def make_document(paragraphs: int, seed: int = 0) -> RichTextDocument:
+    rand = random.Random(seed)
+    texts: list[RichText] = []
+
+    for _ in range(paragraphs):
+        words: list[str] = [rand.choice(WORDS) for _ in range(rand.randint(5, 60))]
+
+        for i in rand.sample(range(len(words)), k=min(3, len(words))):
+            words[i] = wrap_text_in_style(words[i], rand.choice(['italic', 'bold']))
+
+        texts.append(RichText(None, ' '.join(words), set(rand.choice(PARAGRAPH_STYLES))))
+
+    return RichTextDocument(texts)
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument('--paragraphs', type=int, default=20_000)
+    arguments.add_argument('--repeat', type=int, default=3)
+    args = arguments.parse_args()
+
+    document: RichTextDocument = make_document(args.paragraphs)
+    best: float | None = None
+
+    for _ in range(args.repeat):
+        start: float = time.perf_counter()
+        html: str = str(build_html_from_document(document))
+        elapsed: float = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f'{args.paragraphs} paragraphs, {len(html) / 2 ** 20:.1f} MiB of blocks in {best:.3f}s '
+          f'(best of {args.repeat})')
+
+
+if __name__ == '__main__':
+    main()
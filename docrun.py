@@ -1,109 +1,177 @@
 from dataclasses import dataclass
 from richtext import RichText, RichTextDocument
-from anchors import split_on_style, is_open_anchor, is_close_anchor, get_style_from_anchor
+from anchors import AnchorTables, get_tables, iter_runs
 import re
 
 
-@dataclass
+@dataclass(slots=True)
 class DocRun:
     text: str
-    text_styles: set[str]
-    paragraph_styles: set[str]
+    text_styles: frozenset[str]
+    paragraph_styles: frozenset[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class DocPara:
     runs: list[DocRun]
-    styles: set[str]
+    styles: frozenset[str]
 
 
-def make_quotes_curved(text: str) -> str:
-    # Leading apostrophe contractions e.g. ['tis] -> [’tis]
-    text = re.sub(r"(?<![a-zA-Z])'(?=" + '|'.join(['tis', 'twas', 'twere', 'em', 'cause']) + r")", '’', text)
+_interned_styles: dict[frozenset[str], frozenset[str]] = {}
 
-    # Contractions and singular possessives e.g [isn't] -> [isn’t]
-    text = re.sub(r"(?<=\w)'(?=\w)", "’", text)
 
-    # Apostrophes before numbers ['98] -> [’98]
-    text = re.sub(r"'(?=\d)", "’", text)
+def intern_styles(styles: set[str] | frozenset[str]) -> frozenset[str]:
+    """
+    :return: one shared frozenset per combination of styles
+    """
 
-    # Opening single quotes e.g. ['quote] -> [‘quote]
-    text = re.sub(r"(^|[\s(\[{])'(?=\w)", r"\1‘", text)
+    styles = frozenset(styles)
 
-    # Closing single quotes and plural possessives e.g. [plurals'] -> [plurals’]
-    text = text.replace("'", "’")
+    return _interned_styles.setdefault(styles, styles)
 
-    # Opening double quotes e.g. ["quote] -> [“quote]
-    text = re.sub(r'(^|[\s(\[{])"(?=\S)', r'\1“', text)
 
-    # Closing double quotes e.g. [quote"] -> [quote”]
-    text = text.replace('"', '”')
+# A quote opens after the start of the text, whitespace, a dash or an opening bracket, when text follows it.
+# Leading apostrophes e.g. ['tis], ['98] close instead, as does every other quote e.g. [isn't], [plurals'], [quote"]
+OPENING_QUOTES = re.compile(r"""(?<![^\s(\[{—–])(?:'(?!tis|twas|twere|em|cause|\d)(?=\w)|"(?=\S))""")
 
-    return text
+CURVED_OPENING: dict[str, str] = {"'": '‘', '"': '“'}
 
+DASHES = re.compile(r'(?<!-)-{2,3}(?!-)')
 
-def create_run(results: list[DocRun], text: str, styles: set[str], p_styles: set[str], quotes: bool) -> None:
-    if quotes:
-        text = make_quotes_curved(text)
+ELLIPSES = re.compile(r'(?<!\.)\.{3}(?!\.)')
 
-    results.append(DocRun(text, styles.copy(), p_styles))
 
+def _open_quote(match: re.Match) -> str:
+    return CURVED_OPENING[match.group()]
 
-def adapt_from_rich_text(document: RichTextDocument, curved_quotes: bool = False) -> list[DocRun]:
-    def create_runs(texts: list[RichText]):
-        for rt in texts:
-            paragraph_styles: set[str] = rt.paragraph_styles
-            styles: set[str] = set()
-            text: str = rt.text
 
-            while split := split_on_style(text):
-                style, pre, post = split
+def make_quotes_curved(text: str) -> str:
+    text = OPENING_QUOTES.sub(_open_quote, text)
 
-                if pre:
-                    results.append(DocRun(pre, styles.copy(), paragraph_styles))
+    return text.replace("'", '’').replace('"', '”')
 
-                if is_open_anchor(style):
-                    styles.add(get_style_from_anchor(style))
-                elif is_close_anchor(style):
-                    styles.remove(get_style_from_anchor(style))
 
-                text = post
+def make_text_typographic(text: str, quotes: bool = True, dashes: bool = False, ellipses: bool = False) -> str:
+    """
+    Applies smart typography to a whole paragraph, anchors included. Quotes are decided on the text with its
+    anchors removed, so a quote next to a change of style is treated as it reads.
 
-            if text:
-                create_run(results, text + '\n', styles, paragraph_styles, curved_quotes)
+    :param dashes: turns -- and --- into an em dash
+    :param ellipses: turns ... into an ellipsis character
+    """
 
-    results: list[DocRun] = []
+    if dashes:
+        text = DASHES.sub('—', text)
 
-    create_runs(document.texts)
+    if ellipses:
+        text = ELLIPSES.sub('…', text)
 
-    return results
+    if not quotes or ("'" not in text and '"' not in text):
+        return text
+
+    tables: AnchorTables = get_tables()
+    plain: str = tables.pattern.sub('', text)
+    curved: str = make_quotes_curved(plain)
+
+    if len(plain) == len(text):
+        return curved
+
+    # curving never changes the length, so the anchors go back between the same characters
+    parts: list[str] = []
+    last: int = 0
+    offset: int = 0
+
+    for match in tables.pattern.finditer(text):
+        index: int = match.start()
+        offset_end: int = offset + index - last
+        parts.append(curved[offset:offset_end])
+        parts.append(match.group())
+        offset = offset_end
+        last = index + 1
 
+    parts.append(curved[offset:])
 
-def adapt_into_paragraphs_from_rich_text(document: RichTextDocument, curved_quotes: bool = False) -> list[DocPara]:
+    return ''.join(parts)
+
+
+def get_paragraph_text(rt: RichText, curved_quotes: bool, dashes: bool, ellipses: bool) -> str:
+    if curved_quotes or dashes or ellipses:
+        return make_text_typographic(rt.text, curved_quotes, dashes, ellipses)
+
+    return rt.text
+
+
+def adapt_into_paragraphs_from_rich_text(document: RichTextDocument,
+                                         curved_quotes: bool = False,
+                                         dashes: bool = False,
+                                         ellipses: bool = False) -> list[DocPara]:
     results: list[DocPara] = []
 
     for rt in document.texts:
-        runs: list[DocRun] = []
-        styles: set[str] = set()
-        paragraph_styles: set[str] = rt.paragraph_styles
-        text: str = rt.text
+        paragraph_styles: frozenset[str] = intern_styles(rt.paragraph_styles)
+        paragraph: str = get_paragraph_text(rt, curved_quotes, dashes, ellipses)
+        runs: list[DocRun] = [
+            DocRun(text, intern_styles(styles), paragraph_styles) for text, styles in iter_runs(paragraph)
+        ]
+
+        results.append(DocPara(runs, paragraph_styles))
 
-        while split := split_on_style(text):
-            style, pre, post = split
+    return results
 
-            if pre:
-                create_run(runs, pre, styles, paragraph_styles, curved_quotes)
 
-            if is_open_anchor(style):
-                styles.add(get_style_from_anchor(style))
-            elif is_close_anchor(style):
-                styles.remove(get_style_from_anchor(style))
+def flatten_paragraphs(paragraphs: list[DocPara]) -> list[DocRun]:
+    """
+    :return: every run in order, with a newline closing each paragraph's final run
+    """
 
-            text = post
+    results: list[DocRun] = []
 
-        if text:
-            create_run(runs, text, styles, paragraph_styles, curved_quotes)
+    for doc_para in paragraphs:
+        if not doc_para.runs:
+            continue
 
-        results.append(DocPara(runs, paragraph_styles))
+        *runs, last = doc_para.runs
+        results.extend(runs)
+        results.append(DocRun(last.text + '\n', last.text_styles, last.paragraph_styles))
 
     return results
+
+
+def adapt_from_rich_text(document: RichTextDocument,
+                         curved_quotes: bool = False,
+                         dashes: bool = False,
+                         ellipses: bool = False) -> list[DocRun]:
+    return flatten_paragraphs(adapt_into_paragraphs_from_rich_text(document, curved_quotes, dashes, ellipses))
+
+
+def get_paragraphs(document: RichTextDocument,
+                   curved_quotes: bool = False,
+                   dashes: bool = False,
+                   ellipses: bool = False) -> list[DocPara]:
+    """
+    Adapts the document once per set of options and shares the result until the document changes, so every
+    exporter reads the same paragraphs. Treat them as read-only.
+    """
+
+    key: tuple = ('paragraphs', curved_quotes, dashes, ellipses)
+
+    if key not in document.adaptations:
+        document.adaptations[key] = adapt_into_paragraphs_from_rich_text(document, curved_quotes, dashes, ellipses)
+
+    return document.adaptations[key]
+
+
+def get_runs(document: RichTextDocument,
+             curved_quotes: bool = False,
+             dashes: bool = False,
+             ellipses: bool = False) -> list[DocRun]:
+    """
+    The shared paragraphs of get_paragraphs as one list of runs, also kept until the document changes.
+    """
+
+    key: tuple = ('runs', curved_quotes, dashes, ellipses)
+
+    if key not in document.adaptations:
+        document.adaptations[key] = flatten_paragraphs(get_paragraphs(document, curved_quotes, dashes, ellipses))
+
+    return document.adaptations[key]
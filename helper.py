@@ -20,7 +20,7 @@ def destination(dest: str) -> str:
     """
 
     :param dest:
-    :return: docs, wordpress, txt, docx, idml
+    :return: docs, wordpress, txt, docx, docx-stream, idml
     """
 
     dest = dest.lower()
@@ -47,6 +47,10 @@ def destination(dest: str) -> str:
         'microsoft-word': 'docx',
         'ms word': 'docx',
         'doc': 'docx',
+        'docx-stream': 'docx-stream',
+        'docx stream': 'docx-stream',
+        'docx_stream': 'docx-stream',
+        'streaming docx': 'docx-stream',
         'idml': 'idml',
         'indesign': 'idml',
         'in design': 'idml',
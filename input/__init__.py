@@ -1,6 +1,22 @@
-from .get import Metadata, PipelineData, get_pipeline_data
+from .get import Metadata, PipelineData, get_pipeline_data, get_source_data, get_streamed_pipeline_data
+from .cache import CacheStats, evict_cache, get_cache_stats
+from .engine import FetchEngine, get_engine, set_revalidate
+from .limit import set_request_delay
+from .parser import get_parsers
+from .parsed import check_parsed, document_key, store_parsed
+from .stream import StreamingExtractor, iter_rich_text, stream_document
 
 __all__ = [
+    'CacheStats',
+    'FetchEngine',
     'Metadata', 'PipelineData',
-    'get_pipeline_data'
+    'StreamingExtractor',
+    'check_parsed',
+    'document_key',
+    'evict_cache',
+    'get_cache_stats', 'get_engine', 'get_parsers',
+    'get_pipeline_data', 'get_source_data', 'get_streamed_pipeline_data',
+    'iter_rich_text',
+    'set_request_delay', 'set_revalidate',
+    'store_parsed', 'stream_document'
 ]
@@ -1,37 +1,206 @@
 import sqlite3
-from sqlite3 import Cursor
+import zlib
+from dataclasses import dataclass
+from sqlite3 import Connection, Cursor
+from threading import Lock
+
+
+@dataclass
+class CacheEntry:
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    bytes_stored: int = 0
 
 
 class Cache:
-    def __init__(self) -> None:
-        self.conn = sqlite3.connect('.cache')
+    """
+    A single long-lived SQLite connection shared between threads. Bodies are zlib compressed and
+    `timestamp` records when a page was last fetched or revalidated, which `evict` uses to expire pages.
+    """
 
-    def __enter__(self) -> Cursor:
-        cursor: Cursor = self.conn.cursor()
+    def __init__(self, path: str = '.cache', level: int = 6) -> None:
+        self.level: int = level
+        self.lock = Lock()
+        self.stats = CacheStats()
+        self.conn: Connection = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.create_tables()
 
-        cursor.execute("""CREATE TABLE IF NOT EXISTS cache (
-            url TEXT PRIMARY KEY,
-            content TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )""")
+    def __enter__(self) -> Cursor:
+        self.lock.acquire()
 
-        return cursor
+        return self.conn.cursor()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.commit()
-        self.conn.close()
+        try:
+            if exc_type:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+        finally:
+            self.lock.release()
+
+    def create_tables(self) -> None:
+        with self as cursor:
+            cursor.execute("""CREATE TABLE IF NOT EXISTS cache (
+                url TEXT PRIMARY KEY,
+                content TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                etag TEXT,
+                last_modified TEXT,
+                compressed INTEGER DEFAULT 0
+            )""")
+
+            columns: set[str] = {row[1] for row in cursor.execute('PRAGMA table_info(cache)')}
+            new_columns: dict[str, str] = {
+                'etag': 'TEXT',
+                'last_modified': 'TEXT',
+                'compressed': 'INTEGER DEFAULT 0'
+            }
+
+            for column, definition in new_columns.items():
+                if column not in columns:
+                    cursor.execute(f'ALTER TABLE cache ADD COLUMN {column} {definition}')
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS cache_timestamp ON cache (timestamp)')
+
+            cursor.execute("""CREATE TABLE IF NOT EXISTS documents (
+                key TEXT PRIMARY KEY,
+                content BLOB,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )""")
+
+    def get(self, url: str) -> CacheEntry | None:
+        with self as cursor:
+            query: str = 'SELECT content, etag, last_modified, compressed FROM cache WHERE url = ?'
+            result: tuple | None = cursor.execute(query, (url,)).fetchone()
+
+            if not result:
+                self.stats.misses += 1
+                return None
+
+            content, etag, last_modified, compressed = result
+
+            if compressed:
+                content = zlib.decompress(content)
+
+            self.stats.hits += 1
+            self.stats.bytes_read += len(content)
+
+        return CacheEntry(content, etag, last_modified)
+
+    def put(self, url: str, content: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+        compressed: bytes = zlib.compress(content, self.level)
+
+        with self as cursor:
+            cursor.execute("""INSERT INTO cache (url, content, etag, last_modified, compressed)
+                VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT (url) DO UPDATE SET
+                    content = excluded.content,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    compressed = 1,
+                    timestamp = CURRENT_TIMESTAMP""", (url, compressed, etag, last_modified))
+
+            self.stats.bytes_written += len(content)
+            self.stats.bytes_stored += len(compressed)
+
+    def get_document(self, key: str) -> bytes | None:
+        with self as cursor:
+            result: tuple | None = cursor.execute('SELECT content FROM documents WHERE key = ?', (key,)).fetchone()
+
+        return zlib.decompress(result[0]) if result else None
+
+    def put_document(self, key: str, content: bytes) -> None:
+        with self as cursor:
+            cursor.execute("""INSERT INTO documents (key, content) VALUES (?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    content = excluded.content,
+                    timestamp = CURRENT_TIMESTAMP""", (key, zlib.compress(content, self.level)))
+
+    def touch(self, url: str) -> None:
+        with self as cursor:
+            cursor.execute('UPDATE cache SET timestamp = CURRENT_TIMESTAMP WHERE url = ?', (url,))
+
+    def evict(self, max_age: float | None = None, max_bytes: int | None = None) -> int:
+        """
+        :param max_age: seconds since a page was last fetched or revalidated
+        :param max_bytes: total stored size to trim down to, oldest pages first
+        :return: number of pages removed
+        """
+
+        removed: int = 0
+
+        with self as cursor:
+            if max_age is not None:
+                cursor.execute("DELETE FROM cache WHERE timestamp < datetime('now', ?)", (f'-{max_age} seconds',))
+                removed += cursor.rowcount
+                cursor.execute("DELETE FROM documents WHERE timestamp < datetime('now', ?)", (f'-{max_age} seconds',))
+
+            if max_bytes is not None:
+                cursor.execute("""DELETE FROM cache WHERE url IN (
+                    SELECT url FROM (
+                        SELECT url, SUM(length(content)) OVER (ORDER BY timestamp DESC, url) AS total FROM cache
+                    ) WHERE total > ?
+                )""", (max_bytes,))
+                removed += cursor.rowcount
+
+        return removed
+
+    def size(self) -> int:
+        with self as cursor:
+            return cursor.execute('SELECT COALESCE(SUM(length(content)), 0) FROM cache').fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+_cache: Cache | None = None
+_cache_lock = Lock()
+
+
+def get_cache() -> Cache:
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = Cache()
+
+        return _cache
 
 
 def check_cache(url: str) -> bytes | None:
-    with Cache() as cursor:
-        result: tuple = cursor.execute('SELECT content FROM cache WHERE url = ?', (url,)).fetchone()
+    entry: CacheEntry | None = check_cache_entry(url)
+
+    return entry.content if entry else None
+
+
+def check_cache_entry(url: str) -> CacheEntry | None:
+    return get_cache().get(url)
+
+
+def store_cache(url: str, content: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+    get_cache().put(url, content, etag, last_modified)
+
+
+def touch_cache(url: str) -> None:
+    get_cache().touch(url)
 
-        if result:
-            result: bytes = result[0]
 
-        return result
+def evict_cache(max_age: float | None = None, max_bytes: int | None = None) -> int:
+    return get_cache().evict(max_age, max_bytes)
 
 
-def store_cache(url: str, content: bytes) -> None:
-    with Cache() as cursor:
-        cursor.execute('INSERT INTO cache (url, content) VALUES (?, ?)', (url, content))
+def get_cache_stats() -> CacheStats:
+    return get_cache().stats
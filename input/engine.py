@@ -0,0 +1,175 @@
+import asyncio
+import requests
+from threading import Lock, Thread
+from typing import Any, Coroutine, Iterator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from yarl import URL
+from .cache import CacheEntry, check_cache_entry, store_cache, touch_cache
+from .limit import limiter
+
+
+class FetchEngine:
+    """
+    Fetches pages on a private asyncio loop so sync callers can share it from any thread. Each host gets
+    its own keep-alive session and a cap on in-flight requests, and cached pages can be revalidated with
+    If-None-Match/If-Modified-Since instead of being downloaded again.
+    """
+
+    def __init__(self,
+                 per_host: int = 2,
+                 retry: int = 3,
+                 delay: float = 1,
+                 timeout: float = 30,
+                 revalidate: bool = False) -> None:
+        self.per_host: int = per_host
+        self.retry: int = retry
+        self.delay: float = delay
+        self.timeout: float = timeout
+        self.revalidate: bool = revalidate
+        self.sessions: dict[str, requests.Session] = {}
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def get_session(self, host: str) -> requests.Session:
+        if host not in self.sessions:
+            retries = Retry(total=self.retry,
+                            backoff_factor=self.delay,
+                            status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host, max_retries=retries)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self.sessions[host] = session
+
+        return self.sessions[host]
+
+    def get_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.per_host)
+
+        return self.semaphores[host]
+
+    def make_request(self,
+                     session: requests.Session,
+                     url: str,
+                     headers: dict[str, str],
+                     stream: bool = False) -> requests.Response:
+        limiter.wait(URL(url).host)
+
+        return session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+
+    async def acquire(self, host: str) -> None:
+        await self.get_semaphore(host).acquire()
+
+    async def fetch(self, url: str) -> bytes:
+        entry: CacheEntry | None = await asyncio.to_thread(check_cache_entry, url)
+
+        if entry and not self.revalidate:
+            return entry.content
+
+        host: str = URL(url).host
+        session: requests.Session = self.get_session(host)
+
+        async with self.get_semaphore(host):
+            response = await asyncio.to_thread(self.make_request, session, url, get_conditional_headers(entry))
+
+        if response.status_code == 304 and entry:
+            await asyncio.to_thread(touch_cache, url)
+            return entry.content
+
+        response.raise_for_status()
+
+        etag: str | None = response.headers.get('ETag')
+        last_modified: str | None = response.headers.get('Last-Modified')
+        await asyncio.to_thread(store_cache, url, response.content, etag, last_modified)
+
+        return response.content
+
+    def stream(self, url: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        """
+        Yields the page in chunks as it downloads, holding one of the host's request slots until the body is
+        read. Streamed pages are served and revalidated from the cache like fetched ones, but are not stored,
+        since that would mean holding the whole body.
+        """
+
+        entry: CacheEntry | None = check_cache_entry(url)
+
+        if entry and not self.revalidate:
+            yield from iter_chunks(entry.content, chunk_size)
+            return
+
+        host: str = URL(url).host
+        session: requests.Session = self.get_session(host)
+
+        # the semaphores belong to the engine's loop, so the slot is taken and given back there
+        self.run(self.acquire(host))
+
+        try:
+            with self.make_request(session, url, get_conditional_headers(entry), stream=True) as response:
+                if response.status_code == 304 and entry:
+                    touch_cache(url)
+                    yield from iter_chunks(entry.content, chunk_size)
+                    return
+
+                response.raise_for_status()
+                yield from response.iter_content(chunk_size)
+        finally:
+            self.loop.call_soon_threadsafe(self.get_semaphore(host).release)
+
+    async def fetch_many(self, urls: list[str]) -> list[bytes | BaseException]:
+        return await asyncio.gather(*[self.fetch(url) for url in urls], return_exceptions=True)
+
+    def run(self, coroutine: Coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def fetch_sync(self, url: str) -> bytes:
+        return self.run(self.fetch(url))
+
+    def fetch_many_sync(self, urls: list[str]) -> list[bytes | BaseException]:
+        return self.run(self.fetch_many(urls))
+
+    def close(self) -> None:
+        for session in self.sessions.values():
+            session.close()
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def iter_chunks(content: bytes, chunk_size: int) -> Iterator[bytes]:
+    for i in range(0, len(content), chunk_size):
+        yield content[i:i + chunk_size]
+
+
+def get_conditional_headers(entry: CacheEntry | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+
+    if entry and entry.etag:
+        headers['If-None-Match'] = entry.etag
+
+    if entry and entry.last_modified:
+        headers['If-Modified-Since'] = entry.last_modified
+
+    return headers
+
+
+_engine: FetchEngine | None = None
+_engine_lock = Lock()
+
+
+def get_engine() -> FetchEngine:
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            _engine = FetchEngine()
+
+        return _engine
+
+
+def set_revalidate(revalidate: bool) -> None:
+    get_engine().revalidate = revalidate
@@ -1,51 +1,23 @@
-import requests
-from time import sleep
-from threading import Lock
-from bs4 import BeautifulSoup
-from .cache import store_cache, check_cache
-
-
-lock = Lock()
-
-
-def make_request(url: str, retry=3, delay=1, timeout=30) -> bytes | None:
-    with lock:
-        sleep(5)
-
-        for i in range(retry):
-            try:
-                response = requests.get(url, timeout=timeout)
-                response.raise_for_status()
-                return response.content
-            except requests.exceptions.RequestException as e:
-                print(e)
-
-                if i < retry:
-                    sleep(delay)
-                else:
-                    raise
-
-    return None
+from typing import Any, Iterator
+from .engine import get_engine
+from .parser import parse_html
 
 
 def do_fetch(url: str) -> bytes:
-    result: bytes = check_cache(url)
+    return get_engine().fetch_sync(url)
 
-    if result:
-        return result
 
-    result = make_request(url)
+def stream_url_content(url: str, chunk_size: int = 65536) -> Iterator[bytes]:
+    return get_engine().stream(url, chunk_size)
 
-    if result:
-        store_cache(url, result)
-        return result
 
-    return b''
+def parse_url_content(content: bytes, parser: str = 'html.parser') -> Any:
+    return parse_html(content, parser)
 
 
-def fetch_url_content(url: str) -> BeautifulSoup:
+def fetch_url_content(url: str, parser: str = 'html.parser') -> Any:
     result: bytes = do_fetch(url)
 
-    soup = BeautifulSoup(result, 'html.parser')
+    soup = parse_url_content(result, parser)
 
     return soup
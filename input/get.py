@@ -1,9 +1,11 @@
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 from yarl import URL
 from bs4 import BeautifulSoup, Tag
-from .fetch import fetch_url_content
+from lxml.html import HtmlElement
+from .fetch import do_fetch, parse_url_content, stream_url_content
 from .html import get_html_body
-from richtext import RichTextDocument
+from .stream import StreamingExtractor
+from richtext import RichText, RichTextDocument
 from typing import TypedDict
 
 
@@ -41,7 +43,25 @@ def do_get_data(source) -> Any:
     src_type: str = get_source_type(source)
 
     if src_type == 'url':
-        return fetch_url_content(source)
+        return do_fetch(source)
+    else:
+        raise ValueError(f'{src_type} not recognised')
+
+
+def do_parse_data(source, content: Any, parser: str = 'html.parser') -> Any:
+    src_type: str = get_source_type(source)
+
+    if src_type == 'url':
+        return parse_url_content(content, parser)
+    else:
+        raise ValueError(f'{src_type} not recognised')
+
+
+def do_stream_data(source) -> Iterator[bytes]:
+    src_type: str = get_source_type(source)
+
+    if src_type == 'url':
+        return stream_url_content(source)
     else:
         raise ValueError(f'{src_type} not recognised')
 
@@ -60,12 +80,19 @@ def get_body_generic(content) -> Tag:
     if isinstance(content, BeautifulSoup):
         return get_html_body(content)
 
+    if isinstance(content, HtmlElement):
+        return content.body
+
     raise TypeError(f'Unhandled type: {type(content)}')
 
 
 def adaptor(content: Any, plugins: dict or None = None) -> RichTextDocument:
     if isinstance(content, Tag):
         doc = RichTextDocument.from_html(content)
+    elif isinstance(content, HtmlElement):
+        doc = RichTextDocument.from_lxml(content)
+    elif isinstance(content, RichTextDocument):
+        doc = content
     else:
         raise TypeError(f'{content} unhandled')
 
@@ -90,8 +117,15 @@ def get_metadata(content: Any, plugins: dict | None = None) -> dict[str, str]:
     return metadata
 
 
-def get_pipeline_data(source, plugins) -> PipelineData:
-    source = do_get_data(source)
+def get_source_data(source) -> Any:
+    return do_get_data(source)
+
+
+def get_pipeline_data(source, plugins, content: Any = None, parser: str = 'html.parser') -> PipelineData:
+    if content is None:
+        content = get_source_data(source)
+
+    source = do_parse_data(source, content, parser)
     metadata: dict[str, str] = get_metadata(source, plugins)
     content = modify_source(source, plugins)
     body: Any = get_body_generic(content)
@@ -102,3 +136,35 @@ def get_pipeline_data(source, plugins) -> PipelineData:
         'source': source,
         'metadata': metadata
     }
+
+
+def get_streamed_pipeline_data(source, plugins, on_chunk: Callable[[bytes], Any] | None = None) -> PipelineData:
+    """
+    Builds the document while the page downloads, for pages too large to parse whole. There is no
+    complete tree to hand to `modify-source` or `metadata` plugins, so only the title is filled in.
+
+    :param on_chunk: called with each chunk of the page as it arrives
+    """
+
+    extractor = StreamingExtractor()
+    texts: list[RichText] = []
+
+    for chunk in do_stream_data(source):
+        if on_chunk:
+            on_chunk(chunk)
+
+        texts.extend(extractor.feed(chunk))
+
+    texts.extend(extractor.close())
+
+    metadata: dict[str, str] = {
+        'title': extractor.title,
+        'publication': '',
+        'date': ''
+    }
+
+    return {
+        'document': adaptor(RichTextDocument(texts), plugins),
+        'source': source,
+        'metadata': metadata
+    }
@@ -0,0 +1,25 @@
+from time import monotonic, sleep
+from threading import Lock
+
+
+class RateLimiter:
+    def __init__(self, delay: float = 5.0) -> None:
+        self.delay: float = delay
+        self.lock = Lock()
+        self.schedule: dict[str, float] = {}
+
+    def wait(self, host: str) -> None:
+        with self.lock:
+            now: float = monotonic()
+            ready: float = max(now, self.schedule.get(host, now))
+            self.schedule[host] = ready + self.delay
+
+        if ready > now:
+            sleep(ready - now)
+
+
+limiter = RateLimiter()
+
+
+def set_request_delay(delay: float) -> None:
+    limiter.delay = delay
@@ -0,0 +1,166 @@
+import inspect
+import json
+from hashlib import sha256
+from types import CodeType, FunctionType
+from typing import Any, Callable, Iterable
+from anchors import get_anchors_dict
+from richtext import RichText, RichTextDocument
+from styles import text_style_tags
+from .cache import get_cache
+from .get import PipelineData
+
+
+# values whose repr is the same in every run, unlike the default object repr with its address
+CONSTANT_TYPES: tuple[type, ...] = (str, bytes, int, float, complex, bool, type(None))
+
+
+def value_identity(value: Any, seen: set[int]) -> str:
+    if isinstance(value, CONSTANT_TYPES):
+        return repr(value)
+
+    if isinstance(value, CodeType):
+        return code_identity(value, seen)
+
+    if isinstance(value, FunctionType) or hasattr(value, 'steps'):
+        return function_identity(value, seen)
+
+    if isinstance(value, (list, tuple)):
+        return f'({",".join(value_identity(item, seen) for item in value)})'
+
+    if isinstance(value, (set, frozenset)):
+        return f'{{{",".join(sorted(value_identity(item, seen) for item in value))}}}'
+
+    if isinstance(value, dict):
+        items: list[str] = [f'{value_identity(k, seen)}:{value_identity(v, seen)}' for k, v in value.items()]
+        return f'{{{",".join(sorted(items))}}}'
+
+    return type(value).__qualname__
+
+
+def code_identity(code: CodeType, seen: set[int]) -> str:
+    consts: str = ','.join(value_identity(const, seen) for const in code.co_consts)
+
+    return f'{code.co_code.hex()}|{consts}|{",".join(code.co_names)}'
+
+
+def global_names(code: CodeType) -> set[str]:
+    names: set[str] = set(code.co_names)
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= global_names(const)
+
+    return names
+
+
+def function_identity(func: Callable, seen: set[int] | None = None) -> str:
+    """
+    Identifies a function by its source, or its compiled code when the source cannot be read, together with
+    its defaults, the values it closes over and the functions and constants it reads from its module, so
+    changing any of them changes the identity.
+    """
+
+    seen = seen if seen is not None else set()
+    steps: list[Callable] | None = getattr(func, 'steps', None)
+
+    # compiled normalisers are identified by the steps they run
+    if steps is not None:
+        return f'[{",".join([function_identity(step, seen) for step in steps])}]'
+
+    name: str = f'{func.__module__}.{getattr(func, "__qualname__", type(func).__qualname__)}'
+    code: CodeType | None = getattr(func, '__code__', None)
+
+    # recursive and mutually recursive functions are identified by name where they meet again
+    if code is None or id(func) in seen:
+        return name
+
+    seen.add(id(func))
+
+    try:
+        body: str = inspect.getsource(func)
+    except (OSError, TypeError):
+        body = code_identity(code, seen)
+
+    cells: list[Any] = []
+
+    for cell in func.__closure__ or ():
+        try:
+            cells.append(cell.cell_contents)
+        except ValueError:
+            cells.append(None)
+
+    module: dict[str, Any] = getattr(func, '__globals__', {})
+    referenced: list[str] = [
+        f'{n}={value_identity(module[n], seen)}' for n in sorted(global_names(code))
+        if n in module and isinstance(module[n], CONSTANT_TYPES + (FunctionType, list, tuple, set, frozenset, dict))
+    ]
+
+    parts: list[str] = [
+        body,
+        value_identity(func.__defaults__, seen),
+        value_identity(func.__kwdefaults__, seen),
+        value_identity(cells, seen),
+        ','.join(referenced)
+    ]
+
+    digest: str = sha256('\0'.join(parts).encode()).hexdigest()
+
+    return f'{name}:{digest}'
+
+
+def document_key(content: Any, plugins: dict | None, normalise: Iterable[Callable], parser: str = '') -> str:
+    """
+    Identifies a parsed document by its raw bytes, its parser, the registered text styles and every function
+    that shaped it, so editing or reordering a plugin or normalisation step, or registering a style, produces
+    a new key.
+
+    :param content: the raw bytes, or a sha256 object already fed them while they streamed in
+    """
+
+    plugins = plugins or {}
+    functions: dict[str, list] = {
+        namespace: [function_identity(f) for f in funcs] for namespace, funcs in sorted(plugins.items())
+    }
+    functions['normalise'] = [function_identity(f) for f in normalise]
+    functions['parser'] = [parser]
+
+    # registering a text style changes which tags are read as styled and which anchors mark them
+    functions['styles'] = [[name, *anchors] for name, anchors in get_anchors_dict().items()]
+    functions['tags'] = sorted(text_style_tags().items())
+
+    digest = sha256(content) if isinstance(content, bytes) else content.copy()
+    digest.update(json.dumps(functions).encode())
+
+    return digest.hexdigest()
+
+
+def serialise_document(document: RichTextDocument, metadata: dict[str, str]) -> bytes:
+    texts: list = [[rt.text, sorted(rt.paragraph_styles)] for rt in document.texts]
+
+    return json.dumps([metadata, texts], ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def deserialise_document(content: bytes) -> tuple[RichTextDocument, dict[str, str]]:
+    metadata, texts = json.loads(content)
+    document = RichTextDocument([RichText(None, text, set(styles)) for text, styles in texts])
+
+    return document, metadata
+
+
+def check_parsed(key: str, source: Any) -> PipelineData | None:
+    content: bytes | None = get_cache().get_document(key)
+
+    if content is None:
+        return None
+
+    document, metadata = deserialise_document(content)
+
+    return {
+        'document': document,
+        'source': source,
+        'metadata': metadata
+    }
+
+
+def store_parsed(key: str, data: PipelineData) -> None:
+    get_cache().put_document(key, serialise_document(data['document'], data['metadata']))
@@ -0,0 +1,49 @@
+import lxml.html
+import re
+from typing import Any, Callable
+from bs4 import BeautifulSoup, UnicodeDammit
+from lxml.html import HtmlElement
+
+
+def parse_html_parser(content: bytes) -> BeautifulSoup:
+    return BeautifulSoup(content, 'html.parser')
+
+
+TEXT_CARRIAGE_RETURN = re.compile(r'\r(?=[^<>]*(?:<|$))')
+
+
+def prepare_for_lxml(content: bytes) -> str:
+    # decode the way BeautifulSoup would so every backend agrees on the text
+    markup: str = UnicodeDammit(content, is_html=True).unicode_markup or ''
+
+    # libxml2 turns carriage returns in text into newlines, html.parser keeps them; escaping them keeps
+    # the two in step, as split_on_newlines would otherwise break paragraphs at stray carriage returns
+    return TEXT_CARRIAGE_RETURN.sub('&#13;', markup)
+
+
+def parse_lxml(content: bytes) -> BeautifulSoup:
+    return BeautifulSoup(prepare_for_lxml(content), 'lxml')
+
+
+def parse_lxml_native(content: bytes) -> HtmlElement:
+    markup: str = prepare_for_lxml(content)
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    return lxml.html.document_fromstring(markup.encode('utf-8'), parser=parser)
+
+
+def get_parsers() -> dict[str, Callable[[bytes], Any]]:
+    return {
+        'html.parser': parse_html_parser,
+        'lxml': parse_lxml,
+        'lxml-native': parse_lxml_native
+    }
+
+
+def parse_html(content: bytes, parser: str = 'html.parser') -> Any:
+    parsers: dict[str, Callable[[bytes], Any]] = get_parsers()
+
+    if parser not in parsers:
+        raise ValueError(f'parser: {parser} not recognised, expected one of {", ".join(parsers)}')
+
+    return parsers[parser](content)
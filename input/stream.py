@@ -0,0 +1,164 @@
+import codecs
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+from bs4.dammit import EncodingDetector
+from lxml import etree
+from lxml.html import HtmlElement
+from richtext import CONTAINER_TAGS, RichText, RichTextDocument
+from .parser import TEXT_CARRIAGE_RETURN
+
+# how far into a page browsers look for a <meta> charset before decoding it
+PRESCAN_BYTES: int = 1024
+
+
+@dataclass
+class Container:
+    element: HtmlElement
+    styles: set[str]
+    last_child: HtmlElement | None = None
+    text_checked: bool = False
+
+
+class StreamingExtractor:
+    """
+    Incremental counterpart of RichTextDocument.from_lxml. Chunks of HTML are fed in as they arrive and
+    each RichText is handed back as soon as its block closes. Finished blocks are dropped from the tree,
+    so memory use depends on the size of the largest block rather than the size of the page.
+    """
+
+    def __init__(self, encoding: str | None = None) -> None:
+        self.encoding: str | None = encoding
+        self.decoder: codecs.IncrementalDecoder | None = None
+        self.head: bytes = b''
+        self.pending: str = ''
+        self.parser = etree.HTMLPullParser(events=('start', 'end', 'comment', 'pi'))
+        self.stack: list[Container] = []
+        self.in_body: bool = False
+        self.title: str = ''
+
+    def decode(self, chunk: bytes, final: bool = False) -> str:
+        if self.decoder is None:
+            # a declared encoding is looked for in the first PRESCAN_BYTES, however small the chunks arrive
+            self.head += chunk
+
+            if len(self.head) < PRESCAN_BYTES and not final:
+                return ''
+
+            encoding: str = self.encoding or self.detect_encoding(self.head)
+            self.decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            chunk, self.head = self.head, b''
+
+        text: str = self.pending + self.decoder.decode(chunk, final)
+
+        # hold back everything after the last tag opening so a carriage return is only escaped once it is
+        # known to sit in text, as parse_lxml_native does
+        cut: int = len(text) if final else text.rfind('<')
+
+        if cut <= 0:
+            self.pending = text
+            return ''
+
+        self.pending = text[cut:]
+
+        return TEXT_CARRIAGE_RETURN.sub('&#13;', text[:cut])
+
+    @staticmethod
+    def detect_encoding(chunk: bytes) -> str:
+        declared: str | None = EncodingDetector.find_declared_encoding(chunk, is_html=True, search_entire_document=True)
+
+        return declared or 'utf-8'
+
+    def feed(self, chunk: bytes) -> list[RichText]:
+        self.parser.feed(self.decode(chunk))
+
+        return self.read_events()
+
+    def close(self) -> list[RichText]:
+        self.parser.feed(self.decode(b'', final=True))
+        self.parser.close()
+
+        return self.read_events()
+
+    def read_events(self) -> list[RichText]:
+        results: list[RichText] = []
+
+        for event, element in self.parser.read_events():
+            if event == 'start':
+                self.start(element, results)
+            elif event == 'end':
+                self.end(element, results)
+            else:
+                self.child_closed(element, results, empty=True)
+
+        return results
+
+    def flush(self, container: Container, results: list[RichText]) -> None:
+        if not container.text_checked:
+            container.text_checked = True
+
+            if container.element.text:
+                results.append(RichText.from_lxml(None, container.styles))
+
+        if container.last_child is not None:
+            if container.last_child.tail:
+                results.append(RichText.from_lxml(None, container.styles))
+
+            container.element.remove(container.last_child)
+            container.last_child = None
+
+    def is_direct_child(self, element: HtmlElement) -> bool:
+        return bool(self.stack) and element.getparent() is self.stack[-1].element
+
+    def start(self, element: HtmlElement, results: list[RichText]) -> None:
+        if not self.in_body:
+            if element.tag == 'body':
+                self.in_body = True
+                self.stack.append(Container(element, RichText.paragraph_styles_from_tag('body', None)))
+
+            return
+
+        if not self.is_direct_child(element):
+            return
+
+        parent: Container = self.stack[-1]
+        self.flush(parent, results)
+
+        if element.tag in CONTAINER_TAGS:
+            self.stack.append(Container(element, RichText.paragraph_styles_from_tag(element.tag, parent.styles)))
+
+    def end(self, element: HtmlElement, results: list[RichText]) -> None:
+        if not self.in_body:
+            if element.tag == 'title':
+                self.title = element.text or ''
+
+            return
+
+        if self.stack and element is self.stack[-1].element:
+            self.flush(self.stack.pop(), results)
+
+            if self.stack:
+                self.stack[-1].last_child = element
+        else:
+            self.child_closed(element, results)
+
+    def child_closed(self, element: HtmlElement, results: list[RichText], empty: bool = False) -> None:
+        if not self.in_body or not self.is_direct_child(element):
+            return
+
+        parent: Container = self.stack[-1]
+        self.flush(parent, results)
+        results.append(RichText.from_lxml(None if empty else element, parent.styles))
+        parent.last_child = element
+
+
+def iter_rich_text(chunks: Iterable[bytes], encoding: str | None = None) -> Iterator[RichText]:
+    extractor = StreamingExtractor(encoding)
+
+    for chunk in chunks:
+        yield from extractor.feed(chunk)
+
+    yield from extractor.close()
+
+
+def stream_document(chunks: Iterable[bytes], encoding: str | None = None) -> RichTextDocument:
+    return RichTextDocument(list(iter_rich_text(chunks, encoding)))
@@ -1,6 +1,5 @@
-from pipeline import pipeline
+from pipeline import batch_pipeline
 from plugin import load_plugins
-import traceback
 
 
 def main() -> None:
@@ -14,11 +13,7 @@ def main() -> None:
 
     plugins: dict = load_plugins()
 
-    for url in urls:
-        try:
-            pipeline(url, plugins=plugins, output='wordpress')
-        except Exception:
-            traceback.print_exc()
+    batch_pipeline(urls, plugins=plugins, output='wordpress')
 
 
 if __name__ == '__main__':
@@ -53,9 +48,4 @@ if __name__ == '__main__':
         
             OCR
                 i.      look into python libraries for OCR that might be better than my previous attempts
-                
-        SPELLCHECK
-        
-            i.  options to disable certain types of checking
-            ii. group options into some sort of archetype like 'OCR'
 """
@@ -1,7 +1,10 @@
+import re
 from typing import Callable
 from richtext import RichTextDocument, RichText
 from anchors import get_style_anchors
 
+TextStep = Callable[[str], str]
+
 
 def remove_empty(document: RichTextDocument) -> None:
     document.texts = list(filter(lambda rt: rt.text, document.texts))
@@ -58,14 +61,94 @@ def split_on_newlines(document: RichTextDocument) -> None:
     document.texts = new_texts
 
 
+# clean and invert_quotations compiled together: their single character replacements compose into one
+# table, and the spaces around dashes are removed by one pattern. A chain of str.replace calls measures
+# faster than str.translate or a regex with a callback on CPython, as each call is a C-level scan.
+CLEAN_REPLACEMENTS: tuple[tuple[str, str], ...] = (
+    ('\r', ''),
+    ('“', "'"),
+    ('”', "'"),
+    ('"', "'"),
+    ('’', "'"),
+    ('‘', "'"),
+    ('–', '—')
+)
+
+DASH_SPACES = re.compile(' ?— ?')
+
+
+def clean_text(text: str) -> str:
+    for old, new in CLEAN_REPLACEMENTS:
+        text = text.replace(old, new)
+
+    if '—' in text:
+        text = DASH_SPACES.sub('—', text)
+
+    return text
+
+
+def make_bold_swap() -> TextStep:
+    bold_start, bold_end = get_style_anchors('bold')
+    italic_start, italic_end = get_style_anchors('italic')
+
+    def swap_bold_text(text: str) -> str:
+        # like swap_italics_for_bold, which only visits texts that open a bold run
+        if bold_start in text:
+            text = text.replace(bold_start, italic_start).replace(bold_end, italic_end)
+
+        return text
+
+    return swap_bold_text
+
+
+registered_steps: list[TextStep] = []
+
+
+def register_step(step: TextStep) -> None:
+    """
+    Adds a text transformation that runs on every paragraph after the built-in cleaning and before the
+    paragraph is split on newlines.
+    """
+
+    registered_steps.append(step)
+
+
+class Normaliser:
+    """
+    Runs strip_whitespace, remove_empty, clean, swap_italics_for_bold, invert_quotations, any registered
+    steps and split_on_newlines in a single pass over the document, producing the same texts as running
+    them one after another.
+    """
+
+    def __init__(self, steps: list[TextStep]) -> None:
+        self.steps: list[TextStep] = steps
+
+    def __call__(self, document: RichTextDocument) -> None:
+        steps: list[TextStep] = self.steps
+        new_texts: list[RichText] = []
+
+        for rt in document.texts:
+            text: str = rt.text.strip()
+
+            if not text:
+                continue
+
+            for step in steps:
+                text = step(text)
+
+            if '\n' not in text:
+                rt.text = text
+                new_texts.append(rt)
+            else:
+                for s in text.split('\n'):
+                    new_texts.append(RichText(rt.src, s, rt.paragraph_styles))
+
+        document.texts = new_texts
+
+
 def normalisation_pipeline() -> list[Callable[[RichTextDocument], None]]:
     pipeline: list[Callable[[RichTextDocument], None]] = [
-        strip_whitespace,
-        remove_empty,
-        clean,
-        swap_italics_for_bold,
-        invert_quotations,
-        split_on_newlines
+        Normaliser([clean_text, make_bold_swap(), *registered_steps])
     ]
 
     return pipeline
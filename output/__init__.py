@@ -1,12 +1,13 @@
 from .docs import to_docs
 from .txt import to_txt
 from .wordpress import to_wordpress
-from .docx import to_docx
+from .docx import to_docx, to_docx_stream
 from .idml import to_idml
 
 __all__ = [
     'to_docs',
     'to_docx',
+    'to_docx_stream',
     'to_idml',
     'to_txt',
     'to_wordpress'
@@ -0,0 +1,142 @@
+import json
+import os
+import pickle
+import threading
+import httplib2
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Iterator
+from google.auth.credentials import Credentials
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+
+
+SCOPES: list[str] = ['https://www.googleapis.com/auth/documents']
+
+
+def load_credentials(token_file: str = 'token.pickle', secrets_file: str = 'google.json') -> Credentials:
+    creds = None
+
+    # token.pickle stores your access/refresh tokens
+    if os.path.exists(token_file):
+        with open(token_file, 'rb') as token:
+            creds = pickle.load(token)
+
+    # If no valid creds, do login flow
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+            except RefreshError:
+                creds = None  # force re-auth
+
+    if not creds:
+        flow = InstalledAppFlow.from_client_secrets_file(secrets_file, SCOPES)
+        creds = flow.run_local_server(port=0)
+
+        with open(token_file, 'wb') as token:
+            pickle.dump(creds, token)
+
+    return creds
+
+
+def chunk_requests(requests: list[dict], max_requests: int, max_bytes: int) -> Iterator[list[dict]]:
+    """
+    Splits batchUpdate requests into payloads of at most `max_requests` requests and roughly `max_bytes`
+    of JSON, keeping their order. A single request larger than `max_bytes` goes in a payload of its own.
+    """
+
+    chunk: list[dict] = []
+    size: int = 0
+
+    for request in requests:
+        request_size: int = len(json.dumps(request))
+
+        if chunk and (len(chunk) >= max_requests or size + request_size > max_bytes):
+            yield chunk
+            chunk = []
+            size = 0
+
+        chunk.append(request)
+        size += request_size
+
+    if chunk:
+        yield chunk
+
+
+class DocsClient:
+    """
+    Loads credentials and builds the Docs service once, then sends from any thread, each thread over its
+    own connection. Requests that fail with 429 or 5xx are retried `retry` times with exponential backoff.
+    Oversized updates are sent as several batchUpdates in order, which are not applied atomically.
+    """
+
+    def __init__(self,
+                 credentials: Credentials | None = None,
+                 api_endpoint: str | None = None,
+                 retry: int = 5,
+                 workers: int = 4,
+                 max_requests: int = 500,
+                 max_bytes: int = 2_000_000,
+                 timeout: float = 60) -> None:
+        self.credentials: Credentials = credentials or load_credentials()
+        self.retry: int = retry
+        self.workers: int = workers
+        self.max_requests: int = max_requests
+        self.max_bytes: int = max_bytes
+        self.timeout: float = timeout
+        self.local = threading.local()
+
+        options: dict[str, str] | None = {'api_endpoint': api_endpoint} if api_endpoint else None
+        self.service: Any = build('docs', 'v1', credentials=self.credentials, client_options=options)
+
+    def get_http(self) -> AuthorizedHttp:
+        # httplib2 connections are not thread-safe, so each thread keeps its own
+        if not hasattr(self.local, 'http'):
+            self.local.http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=self.timeout))
+
+        return self.local.http
+
+    def execute(self, request: Any) -> dict:
+        return request.execute(http=self.get_http(), num_retries=self.retry)
+
+    def create(self, title: str) -> str:
+        return self.execute(self.service.documents().create(body={'title': title})).get('documentId')
+
+    def batch_update(self, document_id: str, requests: list[dict]) -> None:
+        for chunk in chunk_requests(requests, self.max_requests, self.max_bytes):
+            self.execute(self.service.documents().batchUpdate(documentId=document_id, body={'requests': chunk}))
+
+    def create_document(self, title: str, requests: list[dict]) -> str:
+        document_id: str = self.create(title)
+        self.batch_update(document_id, requests)
+
+        return document_id
+
+    def create_documents(self, documents: list[tuple[str, list[dict]]]) -> list[str]:
+        """
+        Creates and fills documents, at most `workers` at a time.
+
+        :param documents: (title, requests) for each document
+        :return: the new document ids, in the same order
+        """
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(lambda document: self.create_document(*document), documents))
+
+
+_client: DocsClient | None = None
+_client_lock = Lock()
+
+
+def get_client() -> DocsClient:
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = DocsClient()
+
+        return _client
@@ -1,120 +1,110 @@
-import os
-import pickle
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from dataclasses import dataclass
-from typing import Any
+from functools import cache
 from richtext import RichTextDocument
-from docrun import adapt_from_rich_text, DocRun
-from google.auth.exceptions import RefreshError
+from docrun import get_runs, DocRun
 from input import Metadata
+from styles import docs_text_style
+from .client import get_client
 
+# longer text is inserted in several requests, so no single request outgrows a batchUpdate payload
+MAX_INSERT_LENGTH: int = 100_000
 
-@dataclass
-class Document:
-    service: Any
-    id: str
 
+def text_to_insert_request(text: str) -> list[dict]:
+    requests: list[dict] = [{
+        'insertText': {
+            'location': {
+                'index': 1
+            },
+            'text': text[:MAX_INSERT_LENGTH]
+        }
+    }]
+
+    for i in range(MAX_INSERT_LENGTH, len(text), MAX_INSERT_LENGTH):
+        requests.append({
+            'insertText': {
+                'endOfSegmentLocation': {},
+                'text': text[i:i + MAX_INSERT_LENGTH]
+            }
+        })
 
-def create_document(title: str) -> Document:
-    creds = None
+    return requests
 
-    # token.pickle stores your access/refresh tokens
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
 
-    # If no valid creds, do login flow
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-            except RefreshError:
-                creds = None  # force re-auth
+GOOGLE_RESERVED_INDEX_OFFSET: int = 1
 
-    if not creds:
-        client_secrets_file = 'google.json'
-        scopes = ['https://www.googleapis.com/auth/documents']
-        flow = InstalledAppFlow.from_client_secrets_file(client_secrets_file, scopes)
-        creds = flow.run_local_server(port=0)
+PARAGRAPH_STYLES: dict[str, dict] = {
+    'heading1': {'namedStyleType': 'HEADING_1'},
+    'heading2': {'namedStyleType': 'HEADING_2'},
+    'heading3': {'namedStyleType': 'HEADING_3'},
+    'heading4': {'namedStyleType': 'HEADING_4'},
+    'heading5': {'namedStyleType': 'HEADING_5'},
+    'heading6': {'namedStyleType': 'HEADING_6'},
+    'blockquote': {
+        'indentStart': {'magnitude': 36, 'unit': 'PT'},
+        'indentFirstLine': {'magnitude': 36, 'unit': 'PT'}
+    },
+    'align-right': {'alignment': 'END'},
+    'align-centre': {'alignment': 'CENTER'}
+}
 
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
 
-    service = build('docs', 'v1', credentials=creds)
-    document_id = service.documents().create(body={'title': title}).execute().get('documentId')
+@cache
+def docs_paragraph_style(paragraph_styles: frozenset[str]) -> dict:
+    return {ik: iv for ok, inner in PARAGRAPH_STYLES.items() if ok in paragraph_styles for ik, iv in inner.items()}
 
-    return Document(service, document_id)
 
+def utf16_length(text: str) -> int:
+    """
+    Docs indexes text in UTF-16 code units, so characters outside the Basic Multilingual Plane count twice.
+    """
 
-def send_requests_to_document(document: Document, requests: list[dict]) -> None:
-    document.service.documents().batchUpdate(documentId=document.id, body={'requests': requests}).execute()
+    if text.isascii():
+        return len(text)
 
+    return len(text.encode('utf-16-le')) // 2
 
-def text_to_insert_request(text: str) -> list[dict]:
-    return [{
-        'insertText': {
-            'location': {
-                'index': 1
-            },
-            'text': text
-        }
-    }]
 
+def add_style_request(requests: list[dict], kind: str, field: str, style: dict, start: int, end: int, gap: int) -> None:
+    """
+    Appends a style update for [start, end), or extends the previous one when it carries the same style and
+    ends at most `gap` indices before `start`.
+    """
 
-def run_to_style_request(text_styles: set[str], start: int, end: int, requests: list[dict]) -> None:
-    style_map: dict = {
-        'italic': True,
-        'bold': True
-    }
+    if not style:
+        return
 
-    text_styles: dict = {k: v for k, v in style_map.items() if k in text_styles}
+    if requests:
+        previous: dict = requests[-1][kind]
 
-    if text_styles:
-        requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': start,
-                    'endIndex': end
-                },
-                'textStyle': text_styles,
-                'fields': ','.join(text_styles.keys())
+        if start - gap <= previous['range']['endIndex'] <= start and previous[field] == style:
+            previous['range']['endIndex'] = end
+            return
+
+    requests.append({
+        kind: {
+            'range': {
+                'startIndex': start,
+                'endIndex': end
             },
-        })
+            field: style,
+            'fields': ','.join(style.keys())
+        }
+    })
 
 
-def run_to_paragraph_request(paragraph_styles: set[str], start: int, end: int, requests: list[dict]) -> None:
-    para_map: dict[str, dict] = {
-        'heading1': {'namedStyleType': 'HEADING_1'},
-        'heading2': {'namedStyleType': 'HEADING_2'},
-        'heading3': {'namedStyleType': 'HEADING_3'},
-        'heading4': {'namedStyleType': 'HEADING_4'},
-        'heading5': {'namedStyleType': 'HEADING_5'},
-        'heading6': {'namedStyleType': 'HEADING_6'},
-        'blockquote': {
-            'indentStart': {'magnitude': 36, 'unit': 'PT'},
-            'indentFirstLine': {'magnitude': 36, 'unit': 'PT'}
-        },
-        'align-right': {'alignment': 'END'},
-        'align-centre': {'alignment': 'CENTER'}
-    }
+def run_to_style_request(text_styles: frozenset[str], start: int, end: int, requests: list[dict]) -> None:
+    add_style_request(requests, 'updateTextStyle', 'textStyle', docs_text_style(text_styles), start, end, 0)
 
-    paragraph_styles: dict = {
-        ik: iv for ok, inner in para_map.items() if ok in paragraph_styles for ik, iv in inner.items()
-    }
 
-    if paragraph_styles:
-        requests.append({
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': start,
-                    'endIndex': end
-                },
-                'paragraphStyle': paragraph_styles,
-                'fields': ','.join([k for k in paragraph_styles.keys()])
-            }
-        })
+def run_to_paragraph_request(paragraph_styles: frozenset[str], start: int, end: int, requests: list[dict]) -> None:
+    # paragraph ranges one index apart have always been joined as well
+    add_style_request(requests,
+                      'updateParagraphStyle',
+                      'paragraphStyle',
+                      docs_paragraph_style(paragraph_styles),
+                      start,
+                      end,
+                      1)
 
 
 def build_setup_styles(end: int) -> list[dict]:
@@ -154,35 +144,9 @@ def build_setup_styles(end: int) -> list[dict]:
     return [para, text]
 
 
-def flatten_paragraph_requests(paragraph_requests: list[dict]) -> list[dict]:
-    def styles_are_equal(a: dict, b: dict) -> bool:
-        return a['updateParagraphStyle']['paragraphStyle'] == b['updateParagraphStyle']['paragraphStyle']
-
-    def paragraphs_are_adjacent(a: dict, b: dict) -> bool:
-        return a['updateParagraphStyle']['range']['endIndex'] == b['updateParagraphStyle']['range']['startIndex'] - 1
-
-    def merge_indices(a: dict, b: dict) -> None:
-        a['updateParagraphStyle']['range']['endIndex'] = b['updateParagraphStyle']['range']['endIndex']
-
-    i: int = 0
-
-    while i < len(paragraph_requests) - 1:
-        req1: dict = paragraph_requests[i]
-        req2: dict = paragraph_requests[i + 1]
-
-        if styles_are_equal(req1, req2) and paragraphs_are_adjacent(req1, req2):
-            merge_indices(req1, req2)
-            paragraph_requests.pop(i + 1)
-        else:
-            i += 1
-
-    return paragraph_requests
-
-
 def build_requests(runs: list[DocRun]) -> list[dict]:
-    google_reserved_index_offset: int = 1
-    offset: int = google_reserved_index_offset + 0
-    combined_text: str = ''
+    offset: int = GOOGLE_RESERVED_INDEX_OFFSET
+    texts: list[str] = []
     style_requests: list[dict] = []
     paragraph_requests: list[dict] = []
 
@@ -192,21 +156,18 @@ def build_requests(runs: list[DocRun]) -> list[dict]:
         if not text:
             raise ValueError('Run cannot be empty')
 
-        length: int = len(text)
         start: int = offset
-        end: int = offset + length
+        end: int = offset + utf16_length(text)
 
         run_to_style_request(run.text_styles, start, end, style_requests)
         run_to_paragraph_request(run.paragraph_styles, start, end, paragraph_requests)
 
-        combined_text += text
-        offset = google_reserved_index_offset + len(combined_text)
+        texts.append(text)
+        offset = end
 
-    text_request: list[dict] = text_to_insert_request(combined_text)
+    text_request: list[dict] = text_to_insert_request(''.join(texts))
     setup_styles: list[dict] = build_setup_styles(offset)
 
-    paragraph_requests = flatten_paragraph_requests(paragraph_requests)
-
     return text_request + setup_styles + style_requests + paragraph_requests
 
 
@@ -215,8 +176,7 @@ def to_docs(document: RichTextDocument, metadata: Metadata) -> None:
     publication: str = metadata['publication']
     date: str = metadata['date']
 
-    runs: list[DocRun] = adapt_from_rich_text(document)
+    runs: list[DocRun] = get_runs(document)
     requests: list[dict] = build_requests(runs)
 
-    document: Document = create_document(title)
-    send_requests_to_document(document, requests)
+    get_client().create_document(title, requests)
@@ -1,5 +1,7 @@
 from .send import to_docx
+from .stream import to_docx_stream
 
 __all__ = [
-    'to_docx'
+    'to_docx',
+    'to_docx_stream'
 ]
\ No newline at end of file
@@ -4,8 +4,9 @@ from docx.text.paragraph import Paragraph
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Pt, RGBColor
 from pathlib import Path
-from docrun import DocRun, DocPara, adapt_into_paragraphs_from_rich_text
+from docrun import DocRun, DocPara, get_paragraphs
 from input import Metadata
+from styles import docx_font_attributes
 
 
 def is_heading(doc_para: DocPara) -> bool:
@@ -35,26 +36,23 @@ def get_heading_level(doc_para: DocPara) -> int:
     return level
 
 
-def handle_text_alignment(paragraph: Paragraph, paragraph_styles: set[str]) -> None:
-    alignment: str = ''
+ALIGNMENTS: dict[str, WD_ALIGN_PARAGRAPH] = {
+    'align-right': WD_ALIGN_PARAGRAPH.RIGHT,
+    'align-centre': WD_ALIGN_PARAGRAPH.CENTER,
+    'align-justify': WD_ALIGN_PARAGRAPH.JUSTIFY
+}
 
-    for ps in paragraph_styles:
-        if 'align' not in ps:
-            continue
 
-        alignment = ps
-        break
+def get_alignment(paragraph_styles: frozenset[str]) -> str:
+    for ps in paragraph_styles:
+        if 'align' in ps:
+            return ps
 
-    if not alignment:
-        alignment = 'align-justify'
+    return 'align-justify'
 
-    alignment_str_to_enum_map: dict[str, WD_ALIGN_PARAGRAPH] = {
-        'align-right': WD_ALIGN_PARAGRAPH.RIGHT,
-        'align-centre': WD_ALIGN_PARAGRAPH.CENTER,
-        'align-justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-    }
 
-    paragraph.alignment = alignment_str_to_enum_map[alignment]
+def handle_text_alignment(paragraph: Paragraph, paragraph_styles: frozenset[str]) -> None:
+    paragraph.alignment = ALIGNMENTS[get_alignment(paragraph_styles)]
 
 
 def handle_text_indentation(paragraph: Paragraph, paragraph_styles: set[str]) -> None:
@@ -81,7 +79,7 @@ def create_generic_paragraph(doc_para: DocPara, doc: Document) -> Paragraph:
         to_call = make_paragraph
 
     paragraph: Paragraph = to_call(doc_para, doc)
-    styles: set[str] = doc_para.styles
+    styles: frozenset[str] = doc_para.styles
 
     handle_text_alignment(paragraph, styles)
     handle_text_indentation(paragraph, styles)
@@ -93,11 +91,8 @@ def add_text_to_paragraph(runs: list[DocRun], paragraph: Paragraph) -> None:
     for run in runs:
         r = paragraph.add_run(run.text)
 
-        if 'italic' in run.text_styles:
-            r.italic = True
-
-        if 'bold' in run.text_styles:
-            r.bold = True
+        for attribute, value in docx_font_attributes(run.text_styles).items():
+            setattr(r.font, attribute, value)
 
 
 def handle_paragraphs(paragraphs: list[DocPara], doc: Document) -> None:
@@ -132,7 +127,7 @@ def to_docx(document: RichTextDocument, metadata: Metadata) -> None:
 
     directory = Path('export')
     fn = Path(directory, f'{title}.docx')
-    paragraphs: list[DocPara] = adapt_into_paragraphs_from_rich_text(document)
+    paragraphs: list[DocPara] = get_paragraphs(document)
 
     doc = Document()
 
@@ -0,0 +1,205 @@
+import re
+import zipfile
+from functools import cache
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+from lxml import etree
+from xml.sax.saxutils import escape
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import nsmap
+from docx.text.run import Run
+from richtext import RichTextDocument
+from docrun import DocRun, DocPara, get_paragraphs
+from input import Metadata
+from styles import docx_font_attributes
+from .send import ALIGNMENTS, get_alignment, get_heading_level, handle_text_indentation, is_heading, set_document_styles
+
+DOCUMENT_PART: str = 'word/document.xml'
+
+# paragraphs are written to the zip in batches of this many
+FLUSH_EVERY: int = 1000
+
+# what lxml refuses in text, so the stream fails where python-docx would rather than writing a corrupt file
+XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+# python-docx writes tabs and line breaks as elements of their own rather than as text
+RUN_SPECIALS = re.compile(r'([\t\r\n])')
+
+ALIGNMENT_NAMES: dict[str, str] = {
+    'align-right': 'Right',
+    'align-centre': 'Centred',
+    'align-justify': 'Justified'
+}
+
+
+def get_base_style(doc_para: DocPara) -> str:
+    if not is_heading(doc_para):
+        return 'Normal'
+
+    level: int = get_heading_level(doc_para)
+
+    return 'Title' if level == 0 else f'Heading {level}'
+
+
+def get_style_key(doc_para: DocPara) -> tuple[str, str, bool]:
+    return get_base_style(doc_para), get_alignment(doc_para.styles), 'blockquote' in doc_para.styles
+
+
+def add_paragraph_styles(doc: Document, paragraphs: list[DocPara]) -> dict[tuple[str, str, bool], str]:
+    """
+    Adds one named paragraph style per combination of base style, alignment and indentation in the document,
+    in place of formatting every paragraph directly.
+
+    :return: the style id for each combination
+    """
+
+    style_ids: dict[tuple[str, str, bool], str] = {}
+
+    for doc_para in paragraphs:
+        key = get_style_key(doc_para)
+
+        if key in style_ids:
+            continue
+
+        base, alignment, blockquote = key
+        name: str = f'{base} {ALIGNMENT_NAMES[alignment]}' + (' Block Quote' if blockquote else '')
+
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = doc.styles[base]
+        style.paragraph_format.alignment = ALIGNMENTS[alignment]
+        handle_text_indentation(style, doc_para.styles)
+
+        style_ids[key] = style.style_id
+
+    return style_ids
+
+
+@cache
+def run_properties(text_styles: frozenset[str]) -> str:
+    """
+    :return: the <w:rPr> python-docx would give a run with these text styles, or '' for plain text
+    """
+
+    r = OxmlElement('w:r')
+    font = Run(r, None).font
+
+    for attribute, value in docx_font_attributes(text_styles).items():
+        setattr(font, attribute, value)
+
+    if r.rPr is None:
+        return ''
+
+    # the fragment is written inside the body, which already declares the namespace
+    return etree.tostring(r.rPr, encoding='unicode').replace(f' xmlns:w="{nsmap["w"]}"', '')
+
+
+def write_text(parts: list[str], text: str) -> None:
+    if not text:
+        return
+
+    if text[0].isspace() or text[-1].isspace():
+        parts.append(f'<w:t xml:space="preserve">{escape(text)}</w:t>')
+    else:
+        parts.append(f'<w:t>{escape(text)}</w:t>')
+
+
+def write_run(parts: list[str], run: DocRun) -> None:
+    if XML_INVALID.search(run.text):
+        raise ValueError('All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters')
+
+    parts.append('<w:r>')
+    parts.append(run_properties(run.text_styles))
+
+    for piece in RUN_SPECIALS.split(run.text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        else:
+            write_text(parts, piece)
+
+    parts.append('</w:r>')
+
+
+def write_paragraph(parts: list[str], doc_para: DocPara, style_id: str) -> None:
+    parts.append(f'<w:p><w:pPr><w:pStyle w:val="{escape(style_id)}"/></w:pPr>')
+
+    for run in doc_para.runs:
+        write_run(parts, run)
+
+    parts.append('</w:p>')
+
+
+def stream_body(out: BinaryIO, paragraphs: list[DocPara], style_ids: dict[tuple[str, str, bool], str]) -> None:
+    parts: list[str] = []
+
+    for i, doc_para in enumerate(paragraphs, 1):
+        write_paragraph(parts, doc_para, style_ids[get_style_key(doc_para)])
+
+        if i % FLUSH_EVERY == 0:
+            out.write(''.join(parts).encode('utf-8'))
+            parts.clear()
+
+    out.write(''.join(parts).encode('utf-8'))
+
+
+def write_package(fn: Path, template: bytes, paragraphs: list[DocPara], style_ids: dict) -> None:
+    """
+    Copies every part of the skeleton package, writing the document part paragraph by paragraph straight
+    into the compressed entry. The skeleton's body holds only its section properties, so the paragraphs go
+    just before them.
+    """
+
+    with zipfile.ZipFile(BytesIO(template)) as skeleton, zipfile.ZipFile(fn, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for info in skeleton.infolist():
+            data: bytes = skeleton.read(info)
+
+            if info.filename != DOCUMENT_PART:
+                zf.writestr(info, data)
+                continue
+
+            head, sep, tail = data.rpartition(b'<w:sectPr')
+
+            if not sep:
+                raise ValueError(f'{DOCUMENT_PART} has no section properties')
+
+            entry = zipfile.ZipInfo(DOCUMENT_PART, info.date_time)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+
+            with zf.open(entry, 'w') as out:
+                out.write(head)
+                stream_body(out, paragraphs, style_ids)
+                out.write(sep + tail)
+
+
+def to_docx_stream(document: RichTextDocument, metadata: Metadata) -> None:
+    title: str = metadata['title']
+
+    directory = Path('export')
+    fn = Path(directory, f'{title}.docx')
+    paragraphs: list[DocPara] = get_paragraphs(document)
+
+    doc = Document()
+
+    set_document_styles(doc)
+    style_ids: dict[tuple[str, str, bool], str] = add_paragraph_styles(doc, paragraphs)
+
+    skeleton = BytesIO()
+    doc.save(skeleton)
+
+    directory.mkdir(exist_ok=True)
+
+    # written beside the export and moved over it once complete, so a stream that fails part way leaves
+    # no truncated package, and removes nothing but its own partial file
+    partial = Path(directory, f'{title}.docx.part')
+
+    try:
+        write_package(partial, skeleton.getvalue(), paragraphs, style_ids)
+    except Exception:
+        partial.unlink(missing_ok=True)
+        raise
+
+    partial.replace(fn)
@@ -1,88 +1,96 @@
 from richtext import RichTextDocument
-from zipfile import ZipFile
+from zipfile import ZipFile, ZipInfo
 from pathlib import Path
-import shutil
 from lxml import etree
 from lxml.etree import Element, SubElement
+from dataclasses import dataclass
+from functools import cache
+import copy
+from io import BytesIO
 import zipfile
-import os
 from .date import Date, get_formatted_date
-from docrun import DocPara, adapt_into_paragraphs_from_rich_text
-import re
+from docrun import DocPara, get_paragraphs
 from input import Metadata
+from styles import idml_attributes
 
 
 IDML_DIR = Path('output', 'idml')
-WORK_DIR = Path(IDML_DIR, 'working_dir')
 
-
-def repack_idml(title: str) -> None:
-    work_dir = WORK_DIR
-    directory = Path('export')
-    output_file = Path(directory, f'{title}.idml')
-    directory.mkdir(exist_ok=True)
-
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, files in os.walk(work_dir):
-            for file in files:
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, work_dir)
-                zf.write(full_path, rel_path)
+MIMETYPE: str = 'mimetype'
+STORY_TITLE: str = 'Stories/Story_title.xml'
+STORY_BODY: str = 'Stories/Story_body.xml'
 
 
-def extract_idml() -> Path:
-    work_dir: Path = WORK_DIR
+@dataclass
+class Template:
+    entries: list[tuple[ZipInfo, bytes]]
+    stories: dict[str, etree._ElementTree]
 
-    if work_dir.exists():
-        shutil.rmtree(work_dir)
 
-    work_dir.mkdir()
+@cache
+def load_template() -> Template:
+    """
+    Reads the template package once; every export copies the parsed stories rather than extracting it.
+    """
 
     idml_template = Path(IDML_DIR, 'template.idml')
 
     if not idml_template.exists():
-        raise FileNotFoundError
+        raise FileNotFoundError(idml_template)
 
     with ZipFile(idml_template, 'r') as z:
-        z.extractall(work_dir)
+        entries: list[tuple[ZipInfo, bytes]] = [(info, z.read(info)) for info in z.infolist() if not info.is_dir()]
 
-    return work_dir
+    stories = {info.filename: read_xml(data) for info, data in entries if info.filename in (STORY_TITLE, STORY_BODY)}
 
+    return Template(entries, stories)
 
-def read_xml(file: Path) -> etree:
+
+def read_xml(data: bytes) -> etree._ElementTree:
     parser = etree.XMLParser(remove_blank_text=True)
-    return etree.parse(file, parser)
+    return etree.ElementTree(etree.fromstring(data, parser))
 
 
-def write_xml(file: Path, tree) -> None:
-    tree.write(file,
+def write_xml(tree: etree._ElementTree) -> bytes:
+    buffer = BytesIO()
+    tree.write(buffer,
                encoding="utf-8",
                xml_declaration=True,
                pretty_print=True)
 
+    return buffer.getvalue()
 
-def write_title(title: str) -> None:
-    file = Path(WORK_DIR, 'Stories', 'Story_title.xml')
-    tree = read_xml(file)
-    root = tree.getroot()
 
-    title_node = root.find('.//Content')
-    title_node.text = title
+def repack_idml(title: str, template: Template, stories: dict[str, etree._ElementTree]) -> None:
+    directory = Path('export')
+    output_file = Path(directory, f'{title}.idml')
+    directory.mkdir(exist_ok=True)
+
+    # the package must open with its mimetype, stored uncompressed
+    entries = sorted(template.entries, key=lambda entry: entry[0].filename != MIMETYPE)
+
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for info, data in entries:
+            name: str = info.filename
+
+            if name == MIMETYPE:
+                zf.writestr(name, data, zipfile.ZIP_STORED)
+            elif name in stories:
+                zf.writestr(name, write_xml(stories[name]))
+            else:
+                zf.writestr(name, data)
 
-    write_xml(file, tree)
 
+def write_title(tree: etree._ElementTree, title: str) -> None:
+    title_node = tree.getroot().find('.//Content')
+    title_node.text = title
 
-def clear_body() -> None:
-    file = Path(WORK_DIR, 'Stories', 'Story_body.xml')
-    tree = read_xml(file)
-    root = tree.getroot()
 
-    for para in root.findall('.//ParagraphStyleRange'):
+def clear_body(tree: etree._ElementTree) -> None:
+    for para in tree.getroot().findall('.//ParagraphStyleRange'):
         parent = para.getparent()
         parent.remove(para)
 
-    write_xml(file, tree)
-
 
 def make_paragraph(parent, **kwargs) -> Element:
     paragraph = Element('ParagraphStyleRange',
@@ -93,13 +101,8 @@ def make_paragraph(parent, **kwargs) -> Element:
     return paragraph
 
 
-def get_text_styles(styles: set[str]) -> dict[str, str]:
-    text_styles_dict: dict[str, dict[str, str]] = {
-        'italic': {'FontStyle': 'Italic'},
-        'bold': {'AppliedFont': 'EB Garamond Bold'}
-    }
-
-    return {k2: v2 for k, v in text_styles_dict.items() if k in styles for k2, v2 in v.items()}
+def get_text_styles(styles: frozenset[str]) -> dict[str, str]:
+    return idml_attributes(styles)
 
 
 def get_paragraph_style(styles: set[str]) -> dict[str, str]:
@@ -135,14 +138,9 @@ def write_break(paragraph) -> None:
     SubElement(paragraph, 'Br')
 
 
-def write_info(publication: str, date: str) -> None:
-    file = Path(WORK_DIR, 'Stories', 'Story_body.xml')
-    tree = read_xml(file)
-    root = tree.getroot()
-
+def write_info(story, publication: str, date: str) -> None:
     date: Date = get_formatted_date(date)
 
-    story = root.find('Story')
     paragraph = make_paragraph(story,
                                AppliedParagraphStyle='ParagraphStyle/Body Text',
                                FirstLineIndent='0',
@@ -162,8 +160,6 @@ def write_info(publication: str, date: str) -> None:
     write_break(paragraph)
     write_break(paragraph)
 
-    write_xml(file, tree)
-
 
 def write_paragraph(story, doc_para: DocPara) -> None:
     style: dict[str, str] = get_paragraph_style(doc_para.styles)
@@ -176,31 +172,28 @@ def write_paragraph(story, doc_para: DocPara) -> None:
     write_break(paragraph)
 
 
-def write_document(paragraphs: list[DocPara]) -> None:
-    file = Path(WORK_DIR, 'Stories', 'Story_body.xml')
-    tree = read_xml(file)
-    root = tree.getroot()
-    story = root.find('Story')
-
+def write_document(story, paragraphs: list[DocPara]) -> None:
     for doc_para in paragraphs:
         write_paragraph(story, doc_para)
 
-    write_xml(file, tree)
-
 
 def to_idml(document: RichTextDocument, metadata: Metadata) -> None:
-    extract_idml()
+    template: Template = load_template()
 
     title: str = metadata.get('title', '')
     publication: str = metadata.get('publication', '')
     date: str = metadata.get('date', '')
 
-    paragraphs: list[DocPara] = adapt_into_paragraphs_from_rich_text(document, curved_quotes=True)
+    paragraphs: list[DocPara] = get_paragraphs(document, curved_quotes=True)
+
+    stories: dict[str, etree._ElementTree] = {name: copy.deepcopy(tree) for name, tree in template.stories.items()}
+    body: etree._ElementTree = stories[STORY_BODY]
+    story = body.getroot().find('Story')
 
-    clear_body()
-    write_title(title)
-    write_info(publication, date)
+    clear_body(body)
+    write_title(stories[STORY_TITLE], title)
+    write_info(story, publication, date)
 
-    write_document(paragraphs)
+    write_document(story, paragraphs)
 
-    repack_idml(title)
+    repack_idml(title, template, stories)
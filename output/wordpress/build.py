@@ -1,19 +1,19 @@
 import re
-from richtext import RichText, RichTextDocument
-from bs4 import BeautifulSoup
-from bs4.element import Comment, Tag
+from anchors import get_tables
+from richtext import RichText, RichTextCursor, RichTextDocument, soup_string
+from styles import anchor_elements
 
 
-def _get_child(tag_type: str, document: RichTextDocument) -> RichText | None:
+def _get_child(tag_type: str, cursor: RichTextCursor) -> RichText | None:
     if not _get_wrapper_class(tag_type):
         return None
 
-    next_rt: RichText = document.front()
+    next_rt: RichText = cursor.front()
 
     if not next_rt or tag_type not in next_rt.paragraph_styles:
         return None
 
-    return document.pop()
+    return cursor.pop()
 
 
 def _get_wrapper_class(tag: str) -> list[str]:
@@ -22,27 +22,13 @@ def _get_wrapper_class(tag: str) -> list[str]:
     return wrapper_blocks.get(tag, [])
 
 
-def _apply_style_classes(tag: Tag, paragraph_styles: set[str]) -> None:
+def _get_style_classes(paragraph_styles: set[str]) -> list[str]:
     style_map = {
         'align-right': 'has-text-align-right',
         'align-centre': 'has-text-align-center'
     }
 
-    classes = [v for k, v in style_map.items() if k in paragraph_styles]
-
-    if classes:
-        _add_class(tag, classes)
-
-
-def _add_class(tag: Tag, cls: str | list[str]) -> None:
-    classes = tag.attrs.get('class', [])
-
-    if isinstance(cls, str):
-        classes.append(cls)
-    else:
-        classes.extend(cls)
-
-    tag['class'] = classes
+    return [v for k, v in style_map.items() if k in paragraph_styles]
 
 
 def _get_tag_type(paragraph_styles: set[str]) -> str:
@@ -107,81 +93,132 @@ def _get_block_attribute(paragraph_styles: set[str]) -> str:
     return result
 
 
+# any Private Use Area character; those that are not registered anchors are an error
+PRIVATE_USE = re.compile(r"[\uE000-\uF8FF]")
+
+
+class BlockHtml:
+    """
+    Serialised block markup. str() gives the HTML and `text` its text content, as they were read from the
+    BeautifulSoup tree this replaces.
+    """
+
+    def __init__(self) -> None:
+        self.html: list[str] = []
+        self.strings: list[str] = []
+
+    def __str__(self) -> str:
+        return ''.join(self.html)
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.strings)
+
+    def append_text(self, text: str) -> None:
+        # BeautifulSoup collapses a string of only whitespace to a single newline or space
+        text = soup_string(text)
+        self.strings.append(text)
+        self.html.append(text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;'))
+
+    def append_comment(self, comment: str) -> None:
+        self.html.append(f'<!--{comment}-->')
+
+
 def _build_container_class(
-    soup: BeautifulSoup,
-    document: RichTextDocument,
-    tag: Tag,
+    html: BlockHtml,
+    cursor: RichTextCursor,
     tag_type: str,
-    rt: RichText
-) -> Tag:
-    rt.paragraph_styles.remove(tag_type)
-    _build_tag(soup, tag, document, rt)
+    rt: RichText,
+    paragraph_styles: set[str]
+) -> None:
+    _build_tag(html, cursor, rt, paragraph_styles)
 
-    while child := _get_child(tag_type, document):
-        child.paragraph_styles.remove(tag_type)
-        _build_tag(soup, tag, document, child)
+    while child := _get_child(tag_type, cursor):
+        _build_tag(html, cursor, child, child.paragraph_styles - {tag_type})
 
-    return tag
 
+def _build_tag_text(html: BlockHtml, text: str) -> None:
+    """
+    Writes text with its anchors as inline tags. A tag closed out of order also closes the tags opened inside
+    it and an unmatched close is dropped, as the HTML parser did.
+    """
 
-def _replace_anchors_with_tags(text: str) -> str:
-    anchors_to_tags = {
-        '\uE000': '<em>',
-        '\uE001': '</em>',
-        '\uE002': '<strong>',
-        '\uE003': '</strong>'
-    }
+    elements: dict[str, tuple[str, bool]] = anchor_elements()
+    open_tags: list[str] = []
+    last: int = 0
 
-    for old, new in anchors_to_tags.items():
-        text = text.replace(old, new)
+    for match in PRIVATE_USE.finditer(text):
+        index: int = match.start()
 
-    pattern = re.compile(r"[\uE000-\uF8FF]")
-    matches = pattern.findall(text)
+        if index > last:
+            html.append_text(text[last:index])
 
-    assert not matches
+        last = index + 1
+        element: tuple[str, bool] | None = elements.get(match.group())
 
-    return text
+        # an anchor registered without a TextStyle carries no formatting
+        if element is None:
+            if match.group() in get_tables().style_from_anchor:
+                continue
 
+            raise ValueError(f'{match.group()!r} at {index} is not a registered anchor')
 
-def _build_tag_text(tag: Tag, text: str) -> None:
-    text = _replace_anchors_with_tags(text)
-    soup = BeautifulSoup(text, 'html.parser')
+        name, opening = element
 
-    for child in list(soup.children):
-        tag.append(child.extract())
+        if opening:
+            open_tags.append(name)
+            html.html.append(f'<{name}>')
+        elif name in open_tags:
+            while (closed := open_tags.pop()) != name:
+                html.html.append(f'</{closed}>')
 
+            html.html.append(f'</{name}>')
 
-def _insert_tag(tag: Tag, parent: Tag, tag_type: str, paragraph_styles: set[str]) -> None:
-    block_name: str = _get_block_name(tag_type)
-    block_attribute: str = _get_block_attribute(paragraph_styles)
+    if last < len(text):
+        html.append_text(text[last:])
 
-    parent.append(tag)
-    tag.insert_before(Comment(f' wp:{block_name}{block_attribute} '))
-    tag.insert_after(Comment(f' /wp:{block_name} '))
+    while open_tags:
+        html.html.append(f'</{open_tags.pop()}>')
 
 
-def _build_tag(soup: BeautifulSoup, parent: Tag, document: RichTextDocument, rt: RichText) -> None:
-    tag_type: str = _get_tag_type(rt.paragraph_styles)
-    tag = soup.new_tag(tag_type)
+def _build_tag(
+    html: BlockHtml,
+    cursor: RichTextCursor,
+    rt: RichText,
+    paragraph_styles: set[str]
+) -> None:
+    tag_type: str = _get_tag_type(paragraph_styles)
+    wrapper_class: list[str] = _get_wrapper_class(tag_type)
 
-    if wrapper_class := _get_wrapper_class(tag_type):
-        tag = _build_container_class(soup, document, tag, tag_type, rt)
-        _add_class(tag, wrapper_class)
+    if wrapper_class:
+        paragraph_styles = paragraph_styles - {tag_type}
+
+    block_name: str = _get_block_name(tag_type)
+    classes: list[str] = wrapper_class + _get_style_classes(paragraph_styles)
+    class_attribute: str = f' class="{" ".join(classes)}"' if classes else ''
+
+    html.append_comment(f' wp:{block_name}{_get_block_attribute(paragraph_styles)} ')
+    html.html.append(f'<{tag_type}{class_attribute}>')
+
+    if wrapper_class:
+        _build_container_class(html, cursor, tag_type, rt, paragraph_styles)
     else:
-        _build_tag_text(tag, rt.text)
+        _build_tag_text(html, rt.text)
+
+    html.html.append(f'</{tag_type}>')
+    html.append_comment(f' /wp:{block_name} ')
 
-    _insert_tag(tag, parent, tag_type, rt.paragraph_styles)
-    _apply_style_classes(tag, rt.paragraph_styles)
 
+def _build_body(html: BlockHtml, document: RichTextDocument) -> None:
+    cursor: RichTextCursor = document.cursor()
 
-def _build_body(soup: BeautifulSoup, document: RichTextDocument) -> None:
-    while rt := document.pop():
-        _build_tag(soup, soup, document, rt)
+    while rt := cursor.pop():
+        _build_tag(html, cursor, rt, rt.paragraph_styles)
 
 
-def build_html_from_document(document: RichTextDocument) -> BeautifulSoup:
-    soup = BeautifulSoup()
+def build_html_from_document(document: RichTextDocument) -> BlockHtml:
+    html = BlockHtml()
 
-    _build_body(soup, document)
+    _build_body(html, document)
 
-    return soup
+    return html
@@ -0,0 +1,121 @@
+import json
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUSES: set[int] = {429, 500, 502, 503, 504}
+
+# set when a post is created only, so re-publishing never unpublishes a post or reassigns it
+CREATE_ONLY_FIELDS: tuple[str, ...] = ('status', 'author')
+
+
+@dataclass
+class WordPressConfig:
+    endpoint: str
+    name: str
+    password: str
+
+
+def load_config(path: str = 'wordpress.json') -> WordPressConfig:
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    return WordPressConfig(data['endpoint'], data['name'], data['password'].replace(' ', ''))
+
+
+class WordPressClient:
+    """
+    Publishes posts over one pooled, authenticated session. A post whose slug already exists is updated in
+    place rather than duplicated, keeping its status and author, and a publish that fails on the network or
+    with 429/5xx is retried from the slug lookup, so a retry never creates a second draft.
+    """
+
+    def __init__(self,
+                 config: WordPressConfig | None = None,
+                 retry: int = 3,
+                 delay: float = 1,
+                 workers: int = 4,
+                 timeout: float = 30) -> None:
+        self.config: WordPressConfig = config or load_config()
+        self.retry: int = retry
+        self.delay: float = delay
+        self.workers: int = workers
+        self.timeout: float = timeout
+
+        # lookups are safe to retry at the transport level, posts are retried by publish
+        retries = Retry(total=retry, backoff_factor=delay, status_forcelist=list(RETRY_STATUSES))
+        adapter = HTTPAdapter(pool_maxsize=workers, max_retries=retries)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.auth = HTTPBasicAuth(self.config.name, self.config.password)
+
+    def find_post(self, slug: str) -> int | None:
+        params: dict[str, str] = {'slug': slug, 'status': 'any', '_fields': 'id'}
+        response = self.session.get(self.config.endpoint, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        posts: list[dict] = response.json()
+
+        return posts[0]['id'] if posts else None
+
+    def send(self, data: dict) -> dict:
+        post_id: int | None = self.find_post(data['slug'])
+
+        if post_id is None:
+            url: str = self.config.endpoint
+        else:
+            url = f'{self.config.endpoint.rstrip("/")}/{post_id}'
+            data = {field: value for field, value in data.items() if field not in CREATE_ONLY_FIELDS}
+
+        response = self.session.post(url, json=data, timeout=self.timeout)
+        response.raise_for_status()
+
+        return response.json()
+
+    def publish(self, data: dict) -> dict:
+        """
+        :param data: REST API post fields, including its slug
+        :return: the created or updated post
+        """
+
+        for attempt in range(self.retry + 1):
+            try:
+                return self.send(data)
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                response = getattr(e, 'response', None)
+                retryable: bool = response is None or response.status_code in RETRY_STATUSES
+
+                if not retryable or attempt == self.retry:
+                    raise
+
+                time.sleep(self.delay * 2 ** attempt)
+
+    def publish_many(self, posts: list[dict]) -> list[dict]:
+        """
+        Publishes posts, at most `workers` at a time.
+
+        :return: the created or updated posts, in the same order
+        """
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(self.publish, posts))
+
+
+_client: WordPressClient | None = None
+_client_lock = Lock()
+
+
+def get_client() -> WordPressClient:
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = WordPressClient()
+
+        return _client
@@ -1,25 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-from requests.auth import HTTPBasicAuth
-from .build import build_html_from_document
-import json
+from .build import BlockHtml, build_html_from_document
+from .client import get_client
 from string import punctuation
 from richtext import RichTextDocument
 from input import Metadata
 
 
-def send_post_to_wordpress(url: str, data: dict, auth: HTTPBasicAuth) -> int:
-    response = requests.post(url, json=data, auth=auth)
-    return response.status_code
-
-
-def get_endpoint() -> str:
-    with open('wordpress.json', 'r') as f:
-        data = json.load(f)
-
-    return data['endpoint']
-
-
 def generate_slug(title: str) -> str:
     table = str.maketrans(
         'áéíóúḃċḋḟġṁṗṡṫ',
@@ -32,7 +17,7 @@ def generate_slug(title: str) -> str:
     return '-'.join(clean.split(' ')).lower()
 
 
-def generate_rest_api_data(title: str, slug: str, content: BeautifulSoup) -> dict:
+def generate_rest_api_data(title: str, slug: str, content: BlockHtml) -> dict:
     text: str = content.text
     index = min(len(text), 180)
 
@@ -46,29 +31,14 @@ def generate_rest_api_data(title: str, slug: str, content: BeautifulSoup) -> dic
     }
 
 
-def get_auth_data() -> HTTPBasicAuth:
-    with open('wordpress.json', 'r') as f:
-        credentials = json.load(f)
-
-    name: str = credentials['name']
-    pw: str = credentials['password'].replace(' ', '')
-
-    return HTTPBasicAuth(name, pw)
-
-
 def to_wordpress(document: RichTextDocument, metadata: Metadata) -> None:
     title: str = metadata['title']
     publication: str = metadata['publication']
     date: str = metadata['date']
 
-    url: str = get_endpoint()
-    content: BeautifulSoup = build_html_from_document(document)
+    content: BlockHtml = build_html_from_document(document)
     slug: str = generate_slug(title)
     data: dict = generate_rest_api_data(title, slug, content)
-    auth: HTTPBasicAuth = get_auth_data()
-
-    with open('file.txt', 'w') as f:
-        json.dump(data, f, indent=4)
 
-    status_code = send_post_to_wordpress(url, data, auth)
-    print(f'{"Success" if status_code == 201 else "Failure"}')
+    get_client().publish(data)
+    print('Success')
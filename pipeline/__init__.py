@@ -1,5 +1,10 @@
-from .pipe import pipeline
+from .pipe import ExportResult, PipelineResult, pipeline
+from .batch import BatchResult, batch_pipeline
 
 __all__ = [
+    'BatchResult',
+    'ExportResult',
+    'PipelineResult',
+    'batch_pipeline',
     'pipeline'
 ]
@@ -0,0 +1,116 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+from input import CacheStats, get_cache_stats, get_source_data, set_request_delay, set_revalidate
+from .pipe import PipelineResult, pipeline
+from .timing import Timings, format_timings, timed
+
+
+@dataclass
+class BatchResult:
+    source: Any
+    timings: Timings = field(default_factory=dict)
+    error: Exception | None = None
+    result: PipelineResult | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.error and self.result is not None and self.result.succeeded
+
+
+def process_source(result: BatchResult,
+                   content: Any,
+                   plugins: dict,
+                   output: str | list[str],
+                   parser: str,
+                   spellcheck: bool | str,
+                   stream: bool = False) -> None:
+    try:
+        result.result = pipeline(result.source,
+                                 plugins=plugins,
+                                 output=output,
+                                 content=content,
+                                 timings=result.timings,
+                                 parser=parser,
+                                 spellcheck=spellcheck,
+                                 stream=stream)
+    except Exception as e:
+        traceback.print_exc()
+        result.error = e
+
+
+def fetch_source(result: BatchResult,
+                 workers: ThreadPoolExecutor,
+                 plugins: dict,
+                 output: str | list[str],
+                 parser: str,
+                 spellcheck: bool | str) -> None:
+    try:
+        with timed('fetch', result.timings):
+            content: Any = get_source_data(result.source)
+    except Exception as e:
+        traceback.print_exc()
+        result.error = e
+        return
+
+    workers.submit(process_source, result, content, plugins, output, parser, spellcheck)
+
+
+def report(results: list[BatchResult]) -> None:
+    totals: Timings = {}
+
+    for result in results:
+        status: str = 'Success' if result.succeeded else 'Failure'
+        print(f'{status}: {result.source} ({format_timings(result.timings)})')
+
+        if result.result:
+            for export in result.result.exports:
+                outcome: str = f'failed: {export.error!r}' if export.error else 'done'
+                print(f'    {export.destination} {outcome} ({export.elapsed:.2f}s)')
+
+        for stage, elapsed in result.timings.items():
+            totals[stage] = totals.get(stage, 0.0) + elapsed
+
+    failures: int = len([result for result in results if not result.succeeded])
+    print(f'{len(results) - failures}/{len(results)} succeeded ({format_timings(totals)})')
+
+    stats: CacheStats = get_cache_stats()
+    print(f'Cache: {stats.hits} hits, {stats.misses} misses, {stats.bytes_read} bytes read')
+
+
+def batch_pipeline(sources: list[Any],
+                   plugins: dict,
+                   output: str | list[str] = 'docs',
+                   workers: int = 4,
+                   fetchers: int = 16,
+                   delay: float = 5.0,
+                   revalidate: bool = False,
+                   parser: str = 'html.parser',
+                   spellcheck: bool | str = False,
+                   stream: bool = False) -> list[BatchResult]:
+    """
+    Runs many sources through the pipeline at once. Downloads are spread over `fetchers` threads and
+    throttled per host by `delay` seconds (cached pages skip the delay), while parsing, normalisation
+    and export are bounded to `workers` threads. With `revalidate`, cached pages are checked against the
+    server with a conditional request rather than trusted as-is. With `spellcheck`, each source's possible
+    mistakes are written to a review file, and with `stream` each page is parsed as it downloads, see
+    `pipeline`.
+    """
+
+    set_request_delay(delay)
+    set_revalidate(revalidate)
+    results: list[BatchResult] = [BatchResult(source) for source in sources]
+
+    # the fetch pool is shut down first, so every parse job has been submitted before the workers drain
+    with ThreadPoolExecutor(max_workers=workers) as work_pool, ThreadPoolExecutor(max_workers=fetchers) as fetch_pool:
+        for result in results:
+            if stream:
+                # a streamed page downloads while it is parsed, so its worker does the fetching
+                work_pool.submit(process_source, result, None, plugins, output, parser, spellcheck, stream)
+            else:
+                fetch_pool.submit(fetch_source, result, work_pool, plugins, output, parser, spellcheck)
+
+    report(results)
+
+    return results
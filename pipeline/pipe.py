@@ -1,31 +1,74 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from time import perf_counter
+from types import MappingProxyType
 from typing import Any, Callable
 import helper
-from output import to_docs, to_docx, to_idml, to_txt, to_wordpress
+from output import to_docs, to_docx, to_docx_stream, to_idml, to_txt, to_wordpress
 from normalise import normalisation_pipeline
 from richtext import RichTextDocument
-from input import Metadata, PipelineData, get_pipeline_data
+from spellcheck import Mistake, apply_review, find_mistakes, get_profile, get_source_profile, read_review, write_review
+from input import (Metadata, PipelineData, check_parsed, document_key, get_pipeline_data, get_source_data,
+                   get_streamed_pipeline_data, store_parsed)
+from .timing import Timings, timed
 
 BroadcastFunc = Callable[[RichTextDocument, Metadata], None]
 NormaliseFunc = Callable[[RichTextDocument], None]
 
+# streamed pages are cached apart from parsed ones, as no modify-source or metadata plugin has seen them
+STREAMED_PARSER: str = 'stream'
+
+
+@dataclass
+class ExportResult:
+    destination: str
+    elapsed: float = 0.0
+    error: Exception | None = None
+
+
+@dataclass
+class PipelineResult:
+    source: Any
+    metadata: Metadata = field(default_factory=dict)
+    exports: list[ExportResult] = field(default_factory=list)
+    timings: Timings = field(default_factory=dict)
+
+    @property
+    def failures(self) -> list[ExportResult]:
+        return [export for export in self.exports if export.error]
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failures
+
 
 def get_normalisation() -> list[NormaliseFunc]:
     return normalisation_pipeline()
 
 
-def get_sender(output: str | list[str] = 'docs') -> list[BroadcastFunc]:
+def get_sender(output: str | list[str] = 'docs') -> dict[str, BroadcastFunc]:
     if isinstance(output, str):
         output = [output]
 
     senders: dict[str, BroadcastFunc] = {
         'docs': to_docs,
         'docx': to_docx,
+        'docx-stream': to_docx_stream,
         'wordpress': to_wordpress,
         'txt': to_txt,
         'idml': to_idml
     }
 
-    return [senders[o] for o in list(map(lambda o: helper.destination(o), output))]
+    destinations: list[str] = list(map(lambda o: helper.destination(o), output))
+
+    # both write export/{title}.docx, and senders run at once
+    if 'docx' in destinations and 'docx-stream' in destinations:
+        raise ValueError('output: docx and docx-stream write the same file, choose one')
+
+    return {o: senders[o] for o in destinations}
 
 
 def run_pipeline(data: PipelineData, normalise: list[NormaliseFunc]) -> None:
@@ -35,15 +78,132 @@ def run_pipeline(data: PipelineData, normalise: list[NormaliseFunc]) -> None:
         func(document)
 
 
-def propagate_data(senders: list[BroadcastFunc], data: PipelineData) -> None:
-    for sender in senders:
-        sender(data['document'], data['metadata'])
+def review_path(metadata: Metadata) -> Path:
+    return Path('export', f'{metadata["title"]}.spellcheck.json')
+
+
+def review_spelling(source: Any, data: PipelineData, spellcheck: bool | str) -> None:
+    """
+    Writes the document's possible mistakes to export/{title}.spellcheck.json, for `apply_review` to go through
+    later. `spellcheck` names the profile to check with, or is True for the source's profile in spellcheck.json.
+    """
+
+    profile = get_source_profile(source) if spellcheck is True else get_profile(spellcheck)
+    mistakes: list[Mistake] = find_mistakes(data['document'], profile=profile)
+
+    path: Path = review_path(data['metadata'])
+    path.parent.mkdir(exist_ok=True)
+
+    write_review(path, mistakes)
+    print(f'{len(mistakes)} possible mistakes ({profile.name}): {path}')
+
+
+def correct_spelling(data: PipelineData, review: bool | str | Path) -> None:
+    """
+    Goes through a review written by `review_spelling`, asking which suggestion to take for each mistake.
+    `review` is the review file, or True for export/{title}.spellcheck.json.
+    """
+
+    path: Path = review_path(data['metadata']) if review is True else Path(review)
+    fixes: int = apply_review(data['document'], read_review(path))
+    print(f'{fixes} fixes applied from {path}')
+
+
+def send(destination: str, sender: BroadcastFunc, document: RichTextDocument, metadata: Metadata) -> ExportResult:
+    result = ExportResult(destination)
+    start: float = perf_counter()
+
+    try:
+        sender(document, metadata)
+    except Exception as e:
+        traceback.print_exc()
+        result.error = e
 
+    result.elapsed = perf_counter() - start
 
-def pipeline(source: Any, plugins: dict, output: str | list[str] = 'docs') -> None:
-    senders: list[BroadcastFunc] = get_sender(output)
+    return result
+
+
+def propagate_data(senders: dict[str, BroadcastFunc], data: PipelineData) -> list[ExportResult]:
+    """
+    Runs every sender at once on a snapshot of the document and metadata, so they can share it without
+    seeing each other's changes. A failed sender is recorded in its result rather than stopping the others.
+    """
+
+    document: RichTextDocument = data['document'].snapshot()
+    metadata: Metadata = MappingProxyType(dict(data['metadata']))
+
+    with ThreadPoolExecutor(max_workers=max(len(senders), 1)) as pool:
+        futures = [pool.submit(send, dest, sender, document, metadata) for dest, sender in senders.items()]
+
+    return [future.result() for future in futures]
+
+
+def pipeline(source: Any,
+             plugins: dict,
+             output: str | list[str] = 'docs',
+             content: Any = None,
+             timings: Timings | None = None,
+             cached: bool = True,
+             parser: str = 'html.parser',
+             spellcheck: bool | str = False,
+             stream: bool = False,
+             review: bool | str | Path = False) -> PipelineResult:
+    """
+    With `stream`, a source given without `content` is parsed as it downloads, so memory use follows the
+    page's largest block rather than its size. `modify-source` and `metadata` plugins do not run on a
+    streamed page, see `get_streamed_pipeline_data`.
+
+    With `spellcheck`, the document's possible mistakes are written to a review file, see `review_spelling`.
+    With `review`, that file is gone through and the chosen fixes are applied before the document is exported,
+    see `correct_spelling`. The normalised document comes from the cache, so nothing is parsed again. Give
+    `output=[]` to write a review without exporting.
+    """
+
+    timings = {} if timings is None else timings
+    senders: dict[str, BroadcastFunc] = get_sender(output)
     normalise: list[NormaliseFunc] = get_normalisation()
-    data: PipelineData = get_pipeline_data(source, plugins)
+    streamed: PipelineData | None = None
+
+    if stream and content is None:
+        digest = sha256()
+
+        # downloading and parsing overlap, so both are timed as parsing
+        with timed('parse', timings):
+            streamed = get_streamed_pipeline_data(source, plugins, digest.update)
+
+        key: str = document_key(digest, plugins, normalise, STREAMED_PARSER)
+    else:
+        if content is None:
+            with timed('fetch', timings):
+                content = get_source_data(source)
+
+        key = document_key(content, plugins, normalise, parser)
+
+    data: PipelineData | None = check_parsed(key, source) if cached else None
+
+    if data is None:
+        if streamed is not None:
+            data = streamed
+        else:
+            with timed('parse', timings):
+                data = get_pipeline_data(source, plugins, content, parser)
+
+        with timed('normalise', timings):
+            run_pipeline(data, normalise)
+
+        store_parsed(key, data)
+
+    # the review's offsets are into the document as it was checked, so it is applied before a new check
+    if review:
+        with timed('review', timings):
+            correct_spelling(data, review)
+
+    if spellcheck:
+        with timed('spellcheck', timings):
+            review_spelling(source, data, spellcheck)
+
+    with timed('export', timings):
+        exports: list[ExportResult] = propagate_data(senders, data)
 
-    run_pipeline(data, normalise)
-    propagate_data(senders, data)
+    return PipelineResult(source, data['metadata'], exports, timings)
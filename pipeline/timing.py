@@ -0,0 +1,19 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator
+
+Timings = dict[str, float]
+
+
+@contextmanager
+def timed(stage: str, timings: Timings) -> Iterator[None]:
+    start: float = perf_counter()
+
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + perf_counter() - start
+
+
+def format_timings(timings: Timings) -> str:
+    return ', '.join([f'{stage} {elapsed:.2f}s' for stage, elapsed in timings.items()])
@@ -1,14 +1,187 @@
 from bs4.element import PageElement, NavigableString
 from bs4 import Tag
-from typing import Any, Callable
-from anchors import wrap_text_in_style, remove_anchors, has_style
+from lxml.html import HtmlElement
+from typing import Any, Callable, Iterable, SupportsIndex
+from anchors import wrap_text_in_style, remove_anchors, has_style, get_open_anchor, get_styles
+from spans import SpanText
+from styles import text_style_tags
+
+
+PARAGRAPH_STYLE_TAGS: dict[str, str] = {
+    'h1': 'heading1',
+    'h2': 'heading2',
+    'h3': 'heading3',
+    'h4': 'heading4',
+    'h5': 'heading5',
+    'h6': 'heading6',
+    'blockquote': 'blockquote'
+}
+
+IGNORED_TAGS: set[str] = {'body', 'p', 'hr'}
+
+CONTAINER_TAGS: set[str] = {'body', 'div', 'blockquote'}
+
+# BeautifulSoup files the strings inside these under their own types, which Tag.text leaves out
+HIDDEN_TEXT_TAGS: set[str] = {'script', 'style', 'template', 'rt', 'rp'}
+
+PRESERVE_WHITESPACE_TAGS: set[str] = {'pre', 'textarea'}
+
+ASCII_SPACES: str = '\x20\x0a\x09\x0c\x0d'
+
+
+def soup_string(text: str | None, preserve: bool = False) -> str:
+    """
+    BeautifulSoup collapses a string made only of ASCII whitespace to a single newline or space.
+    """
+
+    if not text or preserve or text.strip(ASCII_SPACES):
+        return text or ''
+
+    return '\n' if '\n' in text else ' '
+
+
+def lxml_text(element: HtmlElement, hidden: bool = False, preserve: bool = False) -> str:
+    """
+    Equivalent of BeautifulSoup's Tag.text for an lxml element: comments, processing instructions and
+    script-like content contribute nothing.
+    """
+
+    hidden = hidden or element.tag in HIDDEN_TEXT_TAGS
+    preserve = preserve or element.tag in PRESERVE_WHITESPACE_TAGS
+    parts: list[str] = [soup_string(element.text, preserve)] if not hidden else []
+
+    for child in element:
+        if isinstance(child.tag, str):
+            parts.append(lxml_text(child, hidden, preserve))
+
+        if not hidden:
+            parts.append(soup_string(child.tail, preserve))
+
+    return ''.join(parts)
+
+
+class ParagraphStyles(set):
+    """
+    A text's paragraph styles. Adaptor plugins edit them in place, so every change invalidates the text's
+    document, as RichTextList does for the texts.
+    """
+
+    def __init__(self, owner: 'RichText', styles: Iterable[str] = ()) -> None:
+        super().__init__(styles)
+        self.owner: RichText = owner
+
+    def changed(self) -> None:
+        if self.owner.document is not None:
+            self.owner.document.invalidate()
+
+    def add(self, style: str) -> None:
+        super().add(style)
+        self.changed()
+
+    def remove(self, style: str) -> None:
+        super().remove(style)
+        self.changed()
+
+    def discard(self, style: str) -> None:
+        super().discard(style)
+        self.changed()
+
+    def pop(self) -> str:
+        style: str = super().pop()
+        self.changed()
+        return style
+
+    def clear(self) -> None:
+        super().clear()
+        self.changed()
+
+    def update(self, *others: Iterable[str]) -> None:
+        super().update(*others)
+        self.changed()
+
+    def difference_update(self, *others: Iterable[str]) -> None:
+        super().difference_update(*others)
+        self.changed()
+
+    def intersection_update(self, *others: Iterable[str]) -> None:
+        super().intersection_update(*others)
+        self.changed()
+
+    def symmetric_difference_update(self, other: Iterable[str]) -> None:
+        super().symmetric_difference_update(other)
+        self.changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
 
 
 class RichText:
-    def __init__(self, src: Any, text: str, paragraph_styles: set[str]) -> None:
+    def __init__(self, src: Any, text: str, paragraph_styles: set[str] | frozenset[str]) -> None:
+        self.document: RichTextDocument | None = None
         self.src = src
         self.text: str = text
-        self.paragraph_styles: set[str] = paragraph_styles
+        self.paragraph_styles = paragraph_styles
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._text: str = text
+        self._plain_text: str | None = None
+        self._spans: SpanText | None = None
+
+        if self.document is not None:
+            self.document.invalidate()
+
+    @property
+    def paragraph_styles(self) -> ParagraphStyles:
+        return self._paragraph_styles
+
+    @paragraph_styles.setter
+    def paragraph_styles(self, paragraph_styles: Iterable[str]) -> None:
+        # always a fresh set, so texts built from one another never share their styles
+        self._paragraph_styles: ParagraphStyles = ParagraphStyles(self, paragraph_styles)
+
+        if self.document is not None:
+            self.document.invalidate()
+
+    @property
+    def plain_text(self) -> str:
+        if self._plain_text is None:
+            self._plain_text = remove_anchors(self._text)
+
+        return self._plain_text
+
+    @property
+    def spans(self) -> SpanText:
+        """
+        The text as plain text and style spans, converted on first use and kept until the text changes.
+        """
+
+        if self._spans is None:
+            self._spans = SpanText.from_anchored(self._text)
+
+        return self._spans
+
+    @spans.setter
+    def spans(self, spans: SpanText) -> None:
+        self.text = spans.to_anchored()
+        self._spans = spans
 
     def __str__(self):
         text: str = self.text if len(self.text) < 60 else f'{self.text[:58]}...'
@@ -17,13 +190,7 @@ class RichText:
 
     @classmethod
     def styled_text_from_html(cls, element: PageElement) -> str:
-        style_map: dict[str, str] = {
-            'em': 'italic',
-            'i': 'italic',
-            'strong': 'bold',
-            'b': 'bold'
-        }
-
+        style_map: dict[str, str] = text_style_tags()
         text: str = ''
 
         if isinstance(element, Tag):
@@ -45,21 +212,8 @@ class RichText:
 
         styles: set[str] = set()
 
-        if isinstance(element, Tag):
-            style_map: dict[str, str] = {
-                'h1': 'heading1',
-                'h2': 'heading2',
-                'h3': 'heading3',
-                'h4': 'heading4',
-                'h5': 'heading5',
-                'h6': 'heading6',
-                'blockquote': 'blockquote'
-            }
-
-            ignore: set[str] = {'body', 'p', 'hr'}
-
-            if element.name not in ignore:
-                styles.add(style_map[element.name])
+        if isinstance(element, Tag) and element.name not in IGNORED_TAGS:
+            styles.add(PARAGRAPH_STYLE_TAGS[element.name])
 
         if parent_styles:
             styles = styles.union(parent_styles)
@@ -73,6 +227,47 @@ class RichText:
 
         return cls(element, text, paragraph_styles)
 
+    @classmethod
+    def from_lxml(cls, element: HtmlElement, parent_styles: set[str] | None = None):
+        """
+        :param element: an element, or None for a bare text node (which carries no text, like from_html)
+        """
+
+        text: str = ''
+
+        if element is not None:
+            style_map: dict[str, str] = text_style_tags()
+            parts: list[str] = [soup_string(element.text)]
+
+            for child in element:
+                if isinstance(child.tag, str):
+                    child_text: str = lxml_text(child)
+
+                    if child.tag in style_map:
+                        child_text = wrap_text_in_style(child_text, style_map[child.tag])
+
+                    parts.append(child_text)
+
+                parts.append(soup_string(child.tail))
+
+            text = ''.join(parts)
+
+        styles: set[str] = cls.paragraph_styles_from_tag(element.tag if element is not None else None, parent_styles)
+
+        return cls(element, text, styles)
+
+    @staticmethod
+    def paragraph_styles_from_tag(name: str | None, parent_styles: set[str] | None) -> set[str]:
+        styles: set[str] = set()
+
+        if name is not None and name not in IGNORED_TAGS:
+            styles.add(PARAGRAPH_STYLE_TAGS[name])
+
+        if parent_styles:
+            styles = styles.union(parent_styles)
+
+        return styles
+
     def has_text_style(self, style: str) -> bool:
         return has_style(self.text, style)
 
@@ -80,24 +275,174 @@ class RichText:
         return style in self.paragraph_styles
 
     def has_text(self, text: str) -> bool:
-        return text in remove_anchors(self.text)
+        return text in self.plain_text
+
+
+class DocumentIndex:
+    """
+    Positions of the texts carrying each paragraph style and each text style, built in one pass.
+    """
+
+    def __init__(self, texts: list[RichText]) -> None:
+        self.paragraph_styles: dict[str, list[int]] = {}
+        self.text_styles: dict[str, list[int]] = {}
+
+        anchors: list[tuple[str, str]] = [(style, get_open_anchor(style)) for style in get_styles()]
+
+        for i, rt in enumerate(texts):
+            for ps in rt.paragraph_styles:
+                self.paragraph_styles.setdefault(ps, []).append(i)
+
+            text: str = rt.text
+
+            for style, anchor in anchors:
+                if anchor in text:
+                    self.text_styles.setdefault(style, []).append(i)
+
+
+class RichTextCursor:
+    """
+    Reads through a document's texts front to back in O(1) steps, leaving the document untouched.
+    """
+
+    def __init__(self, texts: list[RichText]) -> None:
+        self.texts: list[RichText] = texts
+        self.position: int = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> RichText:
+        rt: RichText | None = self.pop()
+
+        if rt is None:
+            raise StopIteration
+
+        return rt
+
+    def front(self) -> RichText | None:
+        if self.position >= len(self.texts):
+            return None
+
+        return self.texts[self.position]
+
+    def pop(self) -> RichText | None:
+        rt: RichText | None = self.front()
+
+        if rt is not None:
+            self.position += 1
+
+        return rt
+
+
+class RichTextList(list):
+    """
+    A document's texts. Every change to the list invalidates the document, so the plugins that edit it in
+    place never leave a stale index behind.
+    """
+
+    def __init__(self, document: 'RichTextDocument', texts: Iterable[RichText] = ()) -> None:
+        super().__init__(texts)
+        self.document: RichTextDocument = document
+        self.adopt(self)
+
+    def adopt(self, texts: Iterable[RichText]) -> None:
+        for rt in texts:
+            rt.document = self.document
+
+    def __setitem__(self, key, value) -> None:
+        value = list(value) if isinstance(key, slice) else value
+        super().__setitem__(key, value)
+        self.adopt(value if isinstance(key, slice) else [value])
+        self.document.invalidate()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.document.invalidate()
+
+    def __iadd__(self, texts: Iterable[RichText]) -> 'RichTextList':
+        self.extend(texts)
+        return self
+
+    def __imul__(self, n: int) -> 'RichTextList':
+        super().__imul__(n)
+        self.document.invalidate()
+        return self
+
+    def append(self, rt: RichText) -> None:
+        super().append(rt)
+        rt.document = self.document
+        self.document.invalidate()
+
+    def extend(self, texts: Iterable[RichText]) -> None:
+        texts = list(texts)
+        super().extend(texts)
+        self.adopt(texts)
+        self.document.invalidate()
+
+    def insert(self, index: SupportsIndex, rt: RichText) -> None:
+        super().insert(index, rt)
+        rt.document = self.document
+        self.document.invalidate()
+
+    def pop(self, index: SupportsIndex = -1) -> RichText:
+        rt: RichText = super().pop(index)
+        self.document.invalidate()
+        return rt
+
+    def remove(self, rt: RichText) -> None:
+        super().remove(rt)
+        self.document.invalidate()
+
+    def clear(self) -> None:
+        super().clear()
+        self.document.invalidate()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self.document.invalidate()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.document.invalidate()
 
 
 class RichTextDocument:
     def __init__(self, text: list[RichText]):
         self.texts = text
 
+    @property
+    def texts(self) -> RichTextList:
+        return self._texts
+
+    @texts.setter
+    def texts(self, texts: Iterable[RichText]) -> None:
+        self._texts: RichTextList = RichTextList(self, texts)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Drops the query indexes and adaptations. Changing the texts list, a text's `text` or its
+        `paragraph_styles`, in place or by assignment, does this automatically.
+        """
+
+        self._index: DocumentIndex | None = None
+        self.adaptations: dict[tuple, Any] = {}
+
+    @property
+    def index(self) -> DocumentIndex:
+        if self._index is None:
+            self._index = DocumentIndex(self._texts)
+
+        return self._index
+
     def __str__(self):
         return ' '.join(list(map(lambda rt: rt.text, self.texts)))
 
     @classmethod
     def from_html(cls, tag: Tag):
         def is_container(element: Tag) -> bool:
-            return element.name in {
-                'body',
-                'div',
-                'blockquote'
-            }
+            return element.name in CONTAINER_TAGS
 
         def recursive_travel(element: PageElement, parent: set[str] | None = None) -> None:
             if not isinstance(element, Tag) and not isinstance(element, NavigableString):
@@ -118,40 +463,97 @@ class RichTextDocument:
 
         return cls(results)
 
+    @classmethod
+    def from_lxml(cls, element: HtmlElement):
+        """
+        Builds the same document as from_html without BeautifulSoup. Text nodes and comments that sit
+        directly in a container become empty texts, exactly as NavigableStrings do in from_html.
+        """
+
+        def recursive_travel(node: HtmlElement, parent: set[str] | None = None) -> None:
+            if node.tag not in CONTAINER_TAGS:
+                results.append(RichText.from_lxml(node, parent))
+                return
+
+            container = RichText.from_lxml(node, parent)
+
+            if node.text:
+                results.append(RichText.from_lxml(None, container.paragraph_styles))
+
+            for child in node:
+                if isinstance(child.tag, str):
+                    recursive_travel(child, container.paragraph_styles)
+                else:
+                    results.append(RichText.from_lxml(None, container.paragraph_styles))
+
+                if child.tail:
+                    results.append(RichText.from_lxml(None, container.paragraph_styles))
+
+        results: list[RichText] = []
+
+        recursive_travel(element)
+
+        return cls(results)
+
     def get(self,
             paragraph_style: str | list[str] = '',
             text_style: str | list[str] = '',
             source: Callable[[Any], bool] | None = None,
-            substr: str = '') -> list[RichText]:
+            substr: str = '',
+            match: str = 'any') -> list[RichText]:
+        """
+        :param match: 'any' returns texts meeting at least one of the criteria, 'all' texts meeting every one
+        :return: matching texts in document order, each at most once
+        """
+
+        if match not in ('any', 'all'):
+            raise ValueError(f'match: {match} not recognised')
 
         texts: list[RichText] = self.texts
-        results: list[RichText] = []
+        criteria: list[list[int]] = []
 
-        if paragraph_style:
-            if isinstance(paragraph_style, str):
-                paragraph_style = [paragraph_style]
+        if isinstance(paragraph_style, str):
+            paragraph_style = [paragraph_style] if paragraph_style else []
 
-            for ps in paragraph_style:
-                found = list(filter(lambda rt: rt.has_paragraph_style(ps), texts))
-                results.extend(found)
+        if isinstance(text_style, str):
+            text_style = [text_style] if text_style else []
 
-        if text_style:
-            if isinstance(text_style, str):
-                text_style = [text_style]
+        for ps in paragraph_style:
+            criteria.append(self.index.paragraph_styles.get(ps, []))
 
-            for ts in text_style:
-                found = list(filter(lambda rt: rt.has_text_style(ts), texts))
-                results.extend(found)
+        for ts in text_style:
+            criteria.append(self.index.text_styles.get(ts, []))
 
         if substr:
-            found = list(filter(lambda rt: rt.has_text(substr), texts))
-            results.extend(found)
+            criteria.append([i for i, rt in enumerate(texts) if substr in rt.plain_text])
 
         if source:
-            found = list(filter(lambda rt: source(rt), texts))
-            results.extend(found)
+            criteria.append([i for i, rt in enumerate(texts) if source(rt)])
+
+        if not criteria:
+            return []
+
+        # every criterion is already in document order, so a lone one needs no merging
+        if len(criteria) == 1:
+            return [texts[i] for i in criteria[0]]
+
+        if match == 'all':
+            found: set[int] = set.intersection(*map(set, criteria))
+        else:
+            found = set.union(*map(set, criteria))
+
+        return [texts[i] for i in sorted(found)]
+
+    def snapshot(self) -> 'RichTextDocument':
+        """
+        A copy sharing nothing mutable with this document, for readers working on it concurrently. The
+        texts' source elements are left out, as parse trees are neither immutable nor safe to share.
+        """
+
+        return RichTextDocument([RichText(None, rt.text, rt.paragraph_styles) for rt in self.texts])
 
-        return results
+    def cursor(self) -> RichTextCursor:
+        return RichTextCursor(self.texts)
 
     def pop(self) -> RichText | None:
         if not self.texts:
@@ -0,0 +1,136 @@
+from array import array
+from typing import Iterator
+from anchors import AnchorTables, get_tables, get_style_anchors
+
+
+class SpanText:
+    """
+    Plain text plus a flat array of (start, end, style id) triples, sorted by start, then longest first,
+    then style id. Offsets index the plain text and style ids index anchors.get_styles().
+
+    Conversion to and from the anchor format is lossless for every balanced text; the only thing not
+    recorded is the relative order of anchors that share an offset, which carries no styling.
+    """
+
+    __slots__ = ('text', 'spans')
+
+    def __init__(self, text: str, spans: array | None = None) -> None:
+        self.text: str = text
+        self.spans: array = spans if spans is not None else array('l')
+
+    def __len__(self) -> int:
+        return len(self.spans) // 3
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SpanText) and self.text == other.text and self.spans == other.spans
+
+    @classmethod
+    def from_anchored(cls, anchored: str) -> 'SpanText':
+        tables: AnchorTables = get_tables()
+        style_ids: dict[str, int] = {style: i for i, style in enumerate(tables.styles)}
+        opened: dict[str, list[int]] = {}
+        found: list[tuple[int, int, int]] = []
+        parts: list[str] = []
+        last: int = 0
+        offset: int = 0
+
+        for match in tables.pattern.finditer(anchored):
+            index: int = match.start()
+            parts.append(anchored[last:index])
+            offset += index - last
+            last = index + 1
+
+            anchor: str = match.group()
+            style: str = tables.style_from_anchor[anchor]
+
+            if anchor in tables.open_anchors:
+                opened.setdefault(style, []).append(offset)
+            elif opened.get(style):
+                found.append((opened[style].pop(), -offset, style_ids[style]))
+            else:
+                raise ValueError(f'{style} closed at {offset} without being opened')
+
+        parts.append(anchored[last:])
+        text: str = ''.join(parts)
+
+        for style, starts in opened.items():
+            for start in starts:
+                found.append((start, -len(text), style_ids[style]))
+
+        spans = array('l')
+
+        for start, end, style_id in sorted(found):
+            spans.extend((start, -end, style_id))
+
+        return cls(text, spans)
+
+    def iter_spans(self) -> Iterator[tuple[int, int, str]]:
+        styles: list[str] = get_tables().styles
+        spans: array = self.spans
+
+        for i in range(0, len(spans), 3):
+            yield spans[i], spans[i + 1], styles[spans[i + 2]]
+
+    def to_anchored(self) -> str:
+        # every anchor as (offset, rank, order, anchor): closes sort before empty spans before opens, inner
+        # spans close before the spans around them
+        events: list[tuple[int, int, int, str]] = []
+
+        for order, (start, end, style) in enumerate(self.iter_spans()):
+            open_anchor, close_anchor = get_style_anchors(style)
+
+            if start == end:
+                events.append((start, 1, order, open_anchor + close_anchor))
+            else:
+                events.append((start, 2, order, open_anchor))
+                events.append((end, 0, -order, close_anchor))
+
+        parts: list[str] = []
+        last: int = 0
+
+        for offset, _, _, anchor in sorted(events):
+            parts.append(self.text[last:offset])
+            parts.append(anchor)
+            last = offset
+
+        parts.append(self.text[last:])
+
+        return ''.join(parts)
+
+    def has_style(self, style: str) -> bool:
+        style_id: int = get_tables().styles.index(style)
+
+        return style_id in self.spans[2::3]
+
+    def styles_at(self, offset: int) -> set[str]:
+        return {style for start, end, style in self.iter_spans() if start <= offset < end}
+
+    def runs(self) -> Iterator[tuple[str, frozenset[str]]]:
+        """
+        :return: each stretch of text with the styles active over it, skipping empty stretches
+        """
+
+        boundaries: dict[int, list[tuple[int, str]]] = {}
+
+        for start, end, style in self.iter_spans():
+            if start != end:
+                boundaries.setdefault(start, []).append((1, style))
+                boundaries.setdefault(end, []).append((-1, style))
+
+        active: dict[str, int] = {}
+        last: int = 0
+
+        for offset in sorted(boundaries):
+            if offset > last:
+                yield self.text[last:offset], frozenset(active)
+
+            for change, style in boundaries[offset]:
+                active[style] = active.get(style, 0) + change
+
+                if not active[style]:
+                    del active[style]
+
+            last = offset
+
+        if last < len(self.text):
+            yield self.text[last:], frozenset(active)
@@ -0,0 +1,19 @@
+from .cache import CheckCache
+from .checker import SpellChecker, get_checker
+from .mistake import Mistake
+from .interactive import setup_spellchecker, spellcheck_document, spellcheck_rich_text
+from .profiles import Profile, get_profile, get_source_profile, register_profile
+from .review import apply_review, find_mistakes, read_review, write_review
+
+__all__ = [
+    'CheckCache',
+    'Mistake',
+    'Profile',
+    'SpellChecker',
+    'apply_review',
+    'find_mistakes',
+    'get_checker', 'get_profile', 'get_source_profile',
+    'read_review', 'register_profile',
+    'setup_spellchecker', 'spellcheck_document', 'spellcheck_rich_text',
+    'write_review'
+]
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from dataclasses import asdict
+from sqlite3 import Connection, Cursor
+from threading import Lock
+from .mistake import Mistake
+
+
+def check_key(text: str, config: str) -> str:
+    """
+    :param text: the text as it is sent, without anchors
+    :param config: the language and rules it is checked with
+    """
+
+    return hashlib.sha256(f'{config}\0{text}'.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class CheckCache:
+    """
+    Check results for each text and rule configuration, in one long-lived SQLite connection shared between
+    threads. `used` records when a result was last stored or read; past `max_entries`, the results used
+    longest ago are evicted first.
+    """
+
+    def __init__(self, path: str = '.spellcheck', max_entries: int = 200_000, level: int = 6) -> None:
+        self.max_entries: int = max_entries
+        self.level: int = level
+        self.lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.conn: Connection = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.create_tables()
+
+    def __enter__(self) -> Cursor:
+        self.lock.acquire()
+
+        return self.conn.cursor()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+        finally:
+            self.lock.release()
+
+    def create_tables(self) -> None:
+        with self as cursor:
+            cursor.execute("""CREATE TABLE IF NOT EXISTS checks (
+                key TEXT PRIMARY KEY,
+                mistakes BLOB,
+                used REAL
+            )""")
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS checks_used ON checks (used)')
+
+    def get_many(self, keys: list[str]) -> dict[str, list[Mistake]]:
+        """
+        :return: the stored mistakes for each key found, whose `paragraph` is left at 0
+        """
+
+        found: dict[str, list[Mistake]] = {}
+        now: float = time.time()
+
+        with self as cursor:
+            # well inside SQLite's limit on query parameters
+            for i in range(0, len(keys), 500):
+                chunk: list[str] = keys[i:i + 500]
+                marks: str = ','.join('?' * len(chunk))
+
+                for key, mistakes in cursor.execute(f'SELECT key, mistakes FROM checks WHERE key IN ({marks})', chunk):
+                    found[key] = [Mistake(**mistake) for mistake in json.loads(zlib.decompress(mistakes))]
+
+                cursor.execute(f'UPDATE checks SET used = ? WHERE key IN ({marks})', (now, *chunk))
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def put_many(self, results: dict[str, list[Mistake]]) -> None:
+        now: float = time.time()
+        rows: list[tuple[str, bytes, float]] = []
+
+        for key, mistakes in results.items():
+            data: list[dict] = [asdict(mistake) | {'paragraph': 0} for mistake in mistakes]
+            rows.append((key, zlib.compress(json.dumps(data).encode('utf-8'), self.level), now))
+
+        with self as cursor:
+            cursor.executemany("""INSERT INTO checks (key, mistakes, used) VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    mistakes = excluded.mistakes,
+                    used = excluded.used""", rows)
+
+        self.evict()
+
+    def evict(self, max_entries: int | None = None) -> int:
+        """
+        :return: number of results removed
+        """
+
+        max_entries = self.max_entries if max_entries is None else max_entries
+
+        with self as cursor:
+            cursor.execute("""DELETE FROM checks WHERE key IN (
+                SELECT key FROM checks ORDER BY used DESC LIMIT -1 OFFSET ?
+            )""", (max_entries,))
+
+            return cursor.rowcount
+
+    def size(self) -> int:
+        with self as cursor:
+            return cursor.execute('SELECT COUNT(*) FROM checks').fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
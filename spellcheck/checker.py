@@ -0,0 +1,249 @@
+import json
+import requests
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from threading import Lock
+from typing import Iterator
+from language_tool_python import LanguageTool
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .cache import CheckCache, check_key
+from .mistake import Mistake
+from .profiles import Profile, get_profile, load_config
+
+
+RETRY_STATUSES: set[int] = {429, 500, 502, 503, 504}
+
+# texts sent together are separated as paragraphs, so sentence rules never join them up
+PARAGRAPH_SEPARATOR: str = '\n\n'
+
+
+def utf16_length(text: str) -> int:
+    if text.isascii():
+        return len(text)
+
+    return len(text.encode('utf-16-le')) // 2
+
+
+def utf16_indexes(text: str) -> list[int] | None:
+    """
+    LanguageTool counts offsets in UTF-16 code units, so characters outside the Basic Multilingual Plane
+    count twice.
+
+    :return: the index of the character at each UTF-16 offset, or None when the two are the same
+    """
+
+    if len(text) == utf16_length(text):
+        return None
+
+    indexes: list[int] = []
+
+    for i, char in enumerate(text):
+        indexes.append(i)
+
+        if ord(char) > 0xFFFF:
+            indexes.append(i)
+
+    indexes.append(len(text))
+
+    return indexes
+
+
+def make_batches(texts: list[str], indexes: list[int], max_chars: int) -> Iterator[list[int]]:
+    """
+    Groups the texts at `indexes` into requests of roughly `max_chars` characters.
+
+    :return: the indexes of the texts in each batch
+    """
+
+    batch: list[int] = []
+    size: int = 0
+
+    for i in indexes:
+        text: str = texts[i]
+
+        if batch and size + len(text) > max_chars:
+            yield batch
+            batch = []
+            size = 0
+
+        batch.append(i)
+        size += len(text) + len(PARAGRAPH_SEPARATOR)
+
+    if batch:
+        yield batch
+
+
+class SpellChecker:
+    """
+    Checks text against one long-lived LanguageTool server: a local one started once for the checker's
+    lifetime, or `remote_server` when given. Texts are sent many to a request, several requests at a time,
+    and each text gets back its own mistakes with offsets into it. With a `cache`, a text already checked
+    under the same language and rules is not sent again.
+
+    Each check uses a profile's rules, `profile` unless another is given, and drops the spelling mistakes
+    its dictionaries know.
+    """
+
+    def __init__(self,
+                 language: str = 'en-GB',
+                 remote_server: str | None = None,
+                 profile: Profile | None = None,
+                 workers: int = 4,
+                 max_chars: int = 20_000,
+                 retry: int = 3,
+                 timeout: float = 60,
+                 cache: CheckCache | None = None) -> None:
+        self.language: str = language
+        self.profile: Profile = profile or get_profile('default')
+        self.workers: int = workers
+        self.max_chars: int = max_chars
+        self.timeout: float = timeout
+        self.cache: CheckCache | None = cache
+        self.tool: LanguageTool | None = None
+
+        if remote_server is None:
+            self.tool = LanguageTool(language)
+            url: str = self.tool._url
+        else:
+            url = f'{remote_server.rstrip("/")}/v2/'
+
+        self.url: str = f'{url}check'
+
+        # a check changes nothing on the server, so posts are as safe to retry as lookups
+        retries = Retry(total=retry, backoff_factor=1, status_forcelist=list(RETRY_STATUSES), allowed_methods=None)
+        adapter = HTTPAdapter(pool_maxsize=workers, max_retries=retries)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get_params(self, text: str, profile: Profile) -> dict[str, str]:
+        return {'language': self.language, 'text': text, **profile.get_params()}
+
+    def get_config(self, profile: Profile) -> str:
+        """
+        :return: everything besides the text that decides what LanguageTool finds
+        """
+
+        return json.dumps([self.language, profile.get_params()], sort_keys=True)
+
+    def request(self, text: str, profile: Profile) -> list[dict]:
+        response = self.session.post(self.url, data=self.get_params(text, profile), timeout=self.timeout)
+        response.raise_for_status()
+
+        return response.json()['matches']
+
+    def check_batch(self, texts: list[str], profile: Profile) -> list[list[Mistake]]:
+        lengths: list[int] = [utf16_length(text) for text in texts]
+        starts: list[int] = []
+        offset: int = 0
+
+        for length in lengths:
+            starts.append(offset)
+            offset += length + len(PARAGRAPH_SEPARATOR)
+
+        results: list[list[Mistake]] = [[] for _ in texts]
+
+        # built on a text's first match and shared by the rest, so the cost stays linear in the text
+        text_indexes: dict[int, list[int] | None] = {}
+
+        for match in self.request(PARAGRAPH_SEPARATOR.join(texts), profile):
+            i: int = bisect_right(starts, match['offset']) - 1
+            start: int = match['offset'] - starts[i]
+            end: int = start + match['length']
+
+            # a match reaching into the separator belongs to no one paragraph
+            if end > lengths[i]:
+                continue
+
+            text: str = texts[i]
+
+            if i not in text_indexes:
+                text_indexes[i] = utf16_indexes(text)
+
+            indexes: list[int] | None = text_indexes[i]
+
+            if indexes:
+                start, end = indexes[start], indexes[end]
+
+            results[i].append(Mistake(start,
+                                      end - start,
+                                      text[start:end],
+                                      match['message'],
+                                      [replacement['value'] for replacement in match['replacements']],
+                                      match['rule']['id'],
+                                      match['rule']['category']['id']))
+
+        return results
+
+    def check(self, texts: list[str], profile: Profile | None = None) -> list[list[Mistake]]:
+        """
+        :return: the mistakes in each text, in the same order, with `paragraph` set to the text's index
+        """
+
+        profile = profile or self.profile
+        results: list[list[Mistake]] = [[] for _ in texts]
+
+        # repeated texts are checked once, blank ones not at all
+        first: dict[str, int] = {}
+
+        for i, text in enumerate(texts):
+            if text.strip():
+                first.setdefault(text, i)
+
+        pending: list[int] = list(first.values())
+        keys: dict[int, str] = {}
+
+        if self.cache is not None:
+            config: str = self.get_config(profile)
+            keys = {i: check_key(texts[i], config) for i in pending}
+            cached: dict[str, list[Mistake]] = self.cache.get_many(list(keys.values()))
+            pending = [i for i in pending if keys[i] not in cached]
+
+            for i, key in keys.items():
+                if key in cached:
+                    results[i] = cached[key]
+
+        batches: list[list[int]] = list(make_batches(texts, pending, self.max_chars))
+
+        def check_batch(batch: list[int]) -> list[list[Mistake]]:
+            return self.check_batch([texts[i] for i in batch], profile)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for batch, found in zip(batches, pool.map(check_batch, batches)):
+                for i, mistakes in zip(batch, found):
+                    results[i] = mistakes
+
+        if self.cache is not None and pending:
+            self.cache.put_many({keys[i]: results[i] for i in pending})
+
+        for i, text in enumerate(texts):
+            if i != first.get(text, i):
+                results[i] = results[first[text]]
+
+            # the dictionaries are applied after the cache, so editing them needs no re-check
+            results[i] = [replace(mistake, paragraph=i) for mistake in results[i] if not profile.is_known(mistake)]
+
+        return results
+
+    def close(self) -> None:
+        self.session.close()
+
+        if self.tool is not None:
+            self.tool.close()
+            self.tool = None
+
+
+_checker: SpellChecker | None = None
+_checker_lock = Lock()
+
+
+def get_checker() -> SpellChecker:
+    global _checker
+
+    with _checker_lock:
+        if _checker is None:
+            _checker = SpellChecker(remote_server=load_config().get('remote_server'), cache=CheckCache())
+
+        return _checker
@@ -0,0 +1,42 @@
+from dataclasses import replace
+from richtext import RichText, RichTextDocument
+from .checker import SpellChecker, get_checker
+from .mistake import Mistake
+from .offsets import OffsetIndex, apply_fixes
+from .profiles import Profile
+from .review import apply_review, choose_fix, find_mistakes, print_mistake
+
+
+def setup_spellchecker() -> SpellChecker:
+    return get_checker()
+
+
+def spellcheck_rich_text(rt: RichText, spellchecker: SpellChecker, profile: Profile | None = None) -> None:
+    """
+    Checks the text without its anchors, asks about every mistake, then applies the chosen fixes together.
+    """
+
+    mistakes: list[Mistake] = spellchecker.check([rt.plain_text], profile)[0]
+
+    if not mistakes:
+        return
+
+    index = OffsetIndex(rt.text)
+    fixes: list[tuple[int, int, str]] = []
+
+    for mistake in mistakes:
+        start, end = index.anchored_range(mistake.offset, mistake.offset + mistake.length)
+        print_mistake(replace(mistake, offset=start, length=end - start), rt, index)
+        fix: str | None = choose_fix(mistake)
+
+        if fix is not None:
+            fixes.append((start, end, fix))
+
+    if fixes:
+        rt.text = apply_fixes(rt.text, fixes)
+
+
+def spellcheck_document(document: RichTextDocument,
+                        spellchecker: SpellChecker | None = None,
+                        profile: Profile | None = None) -> None:
+    apply_review(document, find_mistakes(document, spellchecker or setup_spellchecker(), profile))
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Mistake:
+    """
+    One issue found by LanguageTool.
+
+    :param offset: where the flagged text starts, in the text it was found in
+    :param length: the length of the flagged text
+    :param text: the flagged text, without anchors
+    :param paragraph: the index of the paragraph it was found in
+    """
+
+    offset: int
+    length: int
+    text: str
+    message: str
+    replacements: list[str] = field(default_factory=list)
+    rule: str = ''
+    category: str = ''
+    paragraph: int = 0
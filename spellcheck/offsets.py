@@ -0,0 +1,104 @@
+from array import array
+from bisect import bisect_left
+from anchors import get_tables
+
+
+class OffsetIndex:
+    """
+    Where each character of a paragraph's text without anchors sits in the text with them, built in one scan,
+    so every offset LanguageTool returns maps back in constant time.
+    """
+
+    __slots__ = ('length', 'positions')
+
+    def __init__(self, text: str) -> None:
+        self.length: int = len(text)
+        self.positions: array | None = None
+
+        matches = list(get_tables().pattern.finditer(text))
+
+        # without anchors both texts are the same
+        if not matches:
+            return
+
+        positions = array('l')
+        last: int = 0
+
+        for match in matches:
+            positions.extend(range(last, match.start()))
+            last = match.end()
+
+        positions.extend(range(last, len(text)))
+        self.positions = positions
+
+    def anchored(self, offset: int) -> int:
+        """
+        :return: the index of the plain text's character at `offset`, after any anchors just before it
+        """
+
+        if self.positions is None:
+            return offset
+
+        if offset < len(self.positions):
+            return self.positions[offset]
+
+        return self.length
+
+    def anchored_range(self, start: int, end: int) -> tuple[int, int]:
+        """
+        Maps [start, end) of the plain text onto the anchored text. The range starts at its first character
+        and ends after its last, so anchors just outside it stay outside.
+        """
+
+        anchored_start: int = self.anchored(start)
+
+        if end == start:
+            return anchored_start, anchored_start
+
+        return anchored_start, self.anchored(end - 1) + 1
+
+    def plain(self, offset: int) -> int:
+        """
+        :return: the offset in the plain text of the anchored text's `offset`
+        """
+
+        if self.positions is None:
+            return offset
+
+        return bisect_left(self.positions, offset)
+
+
+def apply_fixes(text: str, fixes: list[tuple[int, int, str]]) -> str:
+    """
+    Replaces each [start, end) of the anchored text with its fix in a single pass from the last fix to the
+    first, so no fix moves the offsets of another. Anchors inside a replaced range keep their place in it,
+    up to the end of the fix, and a fix overlapping one already applied is dropped.
+    """
+
+    pattern = get_tables().pattern
+    parts: list[str] = []
+    limit: int = len(text)
+
+    for start, end, fix in sorted(fixes, reverse=True):
+        if end > limit:
+            continue
+
+        parts.append(text[end:limit])
+
+        # the fix is split wherever an anchor sat between the characters it replaces
+        replaced: list[str] = []
+        last: int = 0
+
+        for count, match in enumerate(pattern.finditer(text, start, end)):
+            position: int = min(match.start() - start - count, len(fix))
+            replaced.append(fix[last:position])
+            replaced.append(match.group())
+            last = max(last, position)
+
+        replaced.append(fix[last:])
+        parts.append(''.join(replaced))
+        limit = start
+
+    parts.append(text[:limit])
+
+    return ''.join(reversed(parts))
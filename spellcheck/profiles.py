@@ -0,0 +1,168 @@
+import json
+import re
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+from .mistake import Mistake
+
+DICTIONARY_DIR = Path(__file__).parent / 'dictionaries'
+
+# what LanguageTool files unknown words under, the only mistakes a dictionary can answer
+SPELLING_CATEGORY: str = 'TYPOS'
+
+WORD = re.compile(r"[\w'’-]+")
+
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    A named set of LanguageTool rules, and the dictionaries whose words are never reported as misspelt.
+
+    :param enabled_only: check with the enabled categories and rules alone
+    :param dictionaries: word lists in spellcheck/dictionaries, by file name without .txt
+    """
+
+    name: str
+    disabled_categories: frozenset[str] = frozenset()
+    disabled_rules: frozenset[str] = frozenset()
+    enabled_categories: frozenset[str] = frozenset()
+    enabled_rules: frozenset[str] = frozenset()
+    enabled_only: bool = False
+    dictionaries: tuple[str, ...] = field(default_factory=tuple)
+
+    def get_params(self) -> dict[str, str]:
+        params: dict[str, str] = {}
+        fields: dict[str, frozenset[str]] = {
+            'disabledCategories': self.disabled_categories,
+            'disabledRules': self.disabled_rules,
+            'enabledCategories': self.enabled_categories,
+            'enabledRules': self.enabled_rules
+        }
+
+        for param, values in fields.items():
+            if values:
+                params[param] = ','.join(sorted(values))
+
+        if self.enabled_only:
+            params['enabledOnly'] = 'true'
+
+        return params
+
+    @property
+    def words(self) -> frozenset[str]:
+        return load_words(self.dictionaries)
+
+    def is_known(self, mistake: Mistake) -> bool:
+        """
+        :return: whether every word of a spelling mistake is in the profile's dictionaries
+        """
+
+        if mistake.category != SPELLING_CATEGORY or not self.dictionaries:
+            return False
+
+        words: list[str] = WORD.findall(mistake.text)
+
+        return bool(words) and all(word.casefold() in self.words for word in words)
+
+
+@cache
+def load_dictionary(name: str) -> frozenset[str]:
+    """
+    Reads one word per line, casefolded. Blank lines and lines starting with # are skipped.
+    """
+
+    with open(DICTIONARY_DIR / f'{name}.txt', 'r', encoding='utf-8') as f:
+        return frozenset(line.strip().casefold() for line in f if line.strip() and not line.startswith('#'))
+
+
+@cache
+def load_words(dictionaries: tuple[str, ...]) -> frozenset[str]:
+    return frozenset().union(*(load_dictionary(name) for name in dictionaries))
+
+
+registered_profiles: dict[str, Profile] = {
+    'default': Profile('default'),
+    # old prose: its style, typography and spelling conventions are not mistakes
+    'archival': Profile('archival',
+                        disabled_categories=frozenset({
+                            'STYLE', 'MISC', 'TYPOGRAPHY', 'REDUNDANCY', 'PLAIN_ENGLISH', 'AMERICAN_ENGLISH'
+                        }),
+                        disabled_rules=frozenset({
+                            'IN_THE_MOMENT', 'OXFORD_SPELLING_Z_NOT_S', 'ALL_OF_THE', 'EVEN_ALTHOUGH'
+                        }),
+                        dictionaries=('archaic', 'irish_places', 'period')),
+    # scanned text: misread letters, split and joined words, stray capitals
+    'ocr': Profile('ocr',
+                   enabled_categories=frozenset({'TYPOS', 'CASING', 'COMPOUNDING', 'CONFUSED_WORDS', 'GRAMMAR'}),
+                   enabled_rules=frozenset({'WHITESPACE_RULE', 'COMMA_PARENTHESIS_WHITESPACE'}),
+                   enabled_only=True,
+                   dictionaries=('archaic', 'irish_places', 'period'))
+}
+
+
+def register_profile(profile: Profile) -> None:
+    if profile.name in registered_profiles:
+        raise ValueError(f'profile: {profile.name} is already registered')
+
+    registered_profiles[profile.name] = profile
+
+
+def get_profile(name: str) -> Profile:
+    return registered_profiles[name]
+
+
+@cache
+def load_config() -> dict:
+    try:
+        with open('spellcheck.json', 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def make_profile(name: str, fields: dict[str, Any]) -> Profile:
+    converted: dict[str, Any] = {}
+
+    for key, value in fields.items():
+        if key == 'dictionaries':
+            converted[key] = tuple(value)
+        elif isinstance(value, list):
+            converted[key] = frozenset(value)
+        else:
+            converted[key] = value
+
+    return Profile(name, **converted)
+
+
+@cache
+def load_source_profiles() -> tuple[str, dict[str, str]]:
+    """
+    Registers the profiles in spellcheck.json.
+
+    :return: the default profile name, and the profile name for each host
+    """
+
+    config: dict = load_config()
+
+    for name, fields in config.get('profiles', {}).items():
+        if name not in registered_profiles:
+            register_profile(make_profile(name, fields))
+
+    return config.get('default', 'default'), config.get('sources', {})
+
+
+def get_source_profile(source: Any) -> Profile:
+    """
+    :return: the profile spellcheck.json gives the source's host, with or without www., or its default
+    """
+
+    default, sources = load_source_profiles()
+    host: str = (urlparse(source).hostname or '') if isinstance(source, str) else ''
+
+    for candidate in (host, host.removeprefix('www.')):
+        if candidate in sources:
+            return get_profile(sources[candidate])
+
+    return get_profile(default)
@@ -0,0 +1,127 @@
+import json
+from collections import defaultdict
+from dataclasses import asdict, replace
+from pathlib import Path
+from anchors import get_tables
+from richtext import RichText, RichTextDocument
+from .checker import SpellChecker, get_checker
+from .mistake import Mistake
+from .offsets import OffsetIndex, apply_fixes
+from .profiles import Profile
+
+
+def find_mistakes(document: RichTextDocument,
+                  checker: SpellChecker | None = None,
+                  profile: Profile | None = None) -> list[Mistake]:
+    """
+    Checks every paragraph without stopping for input.
+
+    :return: the mistakes in document order, with offsets into each paragraph's anchored text
+    """
+
+    checker = checker or get_checker()
+    mistakes: list[Mistake] = []
+    found: list[list[Mistake]] = checker.check([rt.plain_text for rt in document.texts], profile)
+
+    for rt, paragraph_mistakes in zip(document.texts, found):
+        if not paragraph_mistakes:
+            continue
+
+        index = OffsetIndex(rt.text)
+
+        for mistake in paragraph_mistakes:
+            start, end = index.anchored_range(mistake.offset, mistake.offset + mistake.length)
+            mistakes.append(replace(mistake, offset=start, length=end - start))
+
+    return mistakes
+
+
+def write_review(path: str | Path, mistakes: list[Mistake]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([asdict(mistake) for mistake in mistakes], f, ensure_ascii=False, indent=2)
+
+
+def read_review(path: str | Path) -> list[Mistake]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Mistake(**mistake) for mistake in json.load(f)]
+
+
+def is_current(mistake: Mistake, document: RichTextDocument) -> bool:
+    """
+    :return: whether the flagged text is still where the review found it
+    """
+
+    if not 0 <= mistake.paragraph < len(document.texts):
+        return False
+
+    text: str = document.texts[mistake.paragraph].text
+    flagged: str = get_tables().pattern.sub('', text[mistake.offset:mistake.offset + mistake.length])
+
+    return flagged == mistake.text
+
+
+def print_mistake(mistake: Mistake, rt: RichText, index: OffsetIndex) -> None:
+    plain: str = rt.plain_text
+    plain_offset: int = index.plain(mistake.offset)
+    context_start: int = max(plain_offset - 40, 0)
+    context: str = plain[context_start:plain_offset + len(mistake.text) + 40]
+    separator: str = '-' * len(context)
+    suggestions: list[str] = mistake.replacements
+
+    print(separator)
+    print(context)
+    print(f'{" " * (plain_offset - context_start)}{"^" * max(len(mistake.text), 1)}')
+    print(f'Reason: {mistake.message}')
+
+    if suggestions:
+        listed: str = ', '.join(f'{i + 1}. "{suggestion}"' for i, suggestion in enumerate(suggestions))
+        print(f'Suggestion{"s" if len(suggestions) > 1 else ""}: {listed}')
+
+    print(separator, end='\n')
+
+
+def choose_fix(mistake: Mistake) -> str | None:
+    get: str = input('> ')
+
+    try:
+        index: int = int(get) - 1
+
+        if index < 0:
+            return None
+
+        return mistake.replacements[index]
+    except (IndexError, ValueError):
+        return None
+
+
+def apply_review(document: RichTextDocument, mistakes: list[Mistake]) -> int:
+    """
+    Asks which suggestion to take for each mistake still in the document, then applies every chosen fix.
+
+    :return: the number of fixes chosen
+    """
+
+    fixes: dict[int, list[tuple[int, int, str]]] = defaultdict(list)
+    indexes: dict[int, OffsetIndex] = {}
+
+    for mistake in mistakes:
+        if not is_current(mistake, document):
+            print(f'Skipping "{mistake.text}", the paragraph has changed since it was checked')
+            continue
+
+        rt: RichText = document.texts[mistake.paragraph]
+
+        if mistake.paragraph not in indexes:
+            indexes[mistake.paragraph] = OffsetIndex(rt.text)
+
+        print_mistake(mistake, rt, indexes[mistake.paragraph])
+        fix: str | None = choose_fix(mistake)
+
+        if fix is not None:
+            fixes[mistake.paragraph].append((mistake.offset, mistake.offset + mistake.length, fix))
+
+    for paragraph, paragraph_fixes in fixes.items():
+        rt = document.texts[paragraph]
+        rt.text = apply_fixes(rt.text, paragraph_fixes)
+
+    return sum(len(paragraph_fixes) for paragraph_fixes in fixes.values())
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any
+from anchors import get_style_anchors, get_styles, register_style
+
+
+@dataclass
+class TextStyle:
+    """
+    How one text style is read from HTML and written by each exporter.
+
+    :param html_tags: tags read as this style; the first is the one written to WordPress
+    :param docs: Google Docs textStyle fields
+    :param docx: python-docx font attributes
+    :param idml: CharacterStyleRange attributes
+    """
+
+    name: str
+    html_tags: tuple[str, ...]
+    docs: dict[str, Any] = field(default_factory=dict)
+    docx: dict[str, Any] = field(default_factory=dict)
+    idml: dict[str, str] = field(default_factory=dict)
+
+
+registered_text_styles: dict[str, TextStyle] = {
+    'italic': TextStyle('italic', ('em', 'i'), {'italic': True}, {'italic': True}, {'FontStyle': 'Italic'}),
+    'bold': TextStyle('bold', ('strong', 'b'), {'bold': True}, {'bold': True}, {'AppliedFont': 'EB Garamond Bold'})
+}
+
+
+def register_text_style(style: TextStyle) -> None:
+    """
+    Adds a text style, giving it a pair of anchors and rebuilding the exporter tables on next use.
+    """
+
+    if style.name in registered_text_styles:
+        raise ValueError(f'style: {style.name} is already registered')
+
+    register_style(style.name)
+    registered_text_styles[style.name] = style
+
+    for table in (text_style_tags,
+                  anchor_elements,
+                  docs_text_style,
+                  docx_font_attributes,
+                  idml_attributes):
+        table.cache_clear()
+
+
+def _merge(styles: frozenset[str], attribute: str) -> dict[str, Any]:
+    # registration order, so combined styles always produce their fields in the same order; a style given
+    # anchors without a TextStyle has no fields for any exporter
+    merged: dict[str, Any] = {}
+
+    for name in get_styles():
+        if name in styles and name in registered_text_styles:
+            merged.update(getattr(registered_text_styles[name], attribute))
+
+    return merged
+
+
+@cache
+def text_style_tags() -> dict[str, str]:
+    return {tag: style.name for style in registered_text_styles.values() for tag in style.html_tags}
+
+
+@cache
+def anchor_elements() -> dict[str, tuple[str, bool]]:
+    """
+    :return: each anchor's HTML tag name and whether it opens the tag
+    """
+
+    elements: dict[str, tuple[str, bool]] = {}
+
+    for style in registered_text_styles.values():
+        start, end = get_style_anchors(style.name)
+        elements[start] = (style.html_tags[0], True)
+        elements[end] = (style.html_tags[0], False)
+
+    return elements
+
+
+@cache
+def docs_text_style(styles: frozenset[str]) -> dict[str, Any]:
+    return _merge(styles, 'docs')
+
+
+@cache
+def docx_font_attributes(styles: frozenset[str]) -> dict[str, Any]:
+    return _merge(styles, 'docx')
+
+
+@cache
+def idml_attributes(styles: frozenset[str]) -> dict[str, str]:
+    return _merge(styles, 'idml')
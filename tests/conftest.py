@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+import pytest
+
+# the modules live at the top of the repository, not in a package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def isolated_styles(monkeypatch):
+    """
+    Lets a test register text styles without them outliving it.
+    """
+
+    import anchors
+    import styles
+
+    tables = (styles.text_style_tags,
+              styles.anchor_elements,
+              styles.docs_text_style,
+              styles.docx_font_attributes,
+              styles.idml_attributes)
+
+    monkeypatch.setattr(anchors, '_registered_anchors', dict(anchors._registered_anchors))
+    monkeypatch.setattr(anchors, '_tables', None)
+    monkeypatch.setattr(styles, 'registered_text_styles', dict(styles.registered_text_styles))
+
+    yield
+
+    for table in tables:
+        table.cache_clear()
@@ -0,0 +1,53 @@
+from anchors import get_style_anchors
+from docrun import get_paragraphs, make_text_typographic
+from richtext import RichText, RichTextDocument
+
+I, I_END = get_style_anchors('italic')
+B, B_END = get_style_anchors('bold')
+
+
+def test_quotes_are_decided_across_style_anchors():
+    # the apostrophe follows a word, so it closes though a bold run ends just before it
+    assert make_text_typographic(f"{B}Davitt{B_END}'s land") == f'{B}Davitt{B_END}’s land'
+
+    # the quote opens a word, so it opens though an italic run starts just before it
+    assert make_text_typographic(f"said {I}'quoted'{I_END}") == f'said {I}‘quoted’{I_END}'
+    assert make_text_typographic(f'said "{I}quoted{I_END}"') == f'said “{I}quoted{I_END}”'
+
+
+def test_quote_after_a_dash_opens():
+    assert make_text_typographic("—'single'") == '—‘single’'
+    assert make_text_typographic("–\"double\"") == '–“double”'
+
+
+def test_leading_apostrophes_close():
+    assert make_text_typographic("'tis the '98 rising") == '’tis the ’98 rising'
+
+
+def test_dashes_flag():
+    text: str = 'a - b -- c --- d ---- e'
+
+    assert make_text_typographic(text) == text
+    assert make_text_typographic(text, dashes=True) == 'a - b — c — d ---- e'
+
+
+def test_ellipses_flag():
+    text: str = 'wait.. wait... wait....'
+
+    assert make_text_typographic(text) == text
+    assert make_text_typographic(text, ellipses=True) == 'wait.. wait… wait....'
+
+
+def test_flags_leave_quotes_alone_when_off():
+    assert make_text_typographic("it's -- ...", quotes=False, dashes=True, ellipses=True) == "it's — …"
+
+
+def test_paragraphs_are_adapted_once_per_set_of_options():
+    document = RichTextDocument([RichText(None, "it's -- done", set())])
+
+    plain = get_paragraphs(document)
+    typographic = get_paragraphs(document, curved_quotes=True, dashes=True)
+
+    assert plain[0].runs[0].text == "it's -- done"
+    assert typographic[0].runs[0].text == 'it’s — done'
+    assert get_paragraphs(document) is plain
@@ -0,0 +1,30 @@
+from anchors import wrap_text_in_style
+from docrun import get_runs
+from output.docs.send import build_requests
+from richtext import RichText, RichTextDocument
+
+
+def styled_ranges(requests: list[dict], kind: str) -> list[tuple[int, int]]:
+    return [(r[kind]['range']['startIndex'], r[kind]['range']['endIndex']) for r in requests if kind in r]
+
+
+def utf16_slice(text: str, start: int, end: int) -> str:
+    # Docs indexes start at 1
+    return text.encode('utf-16-le')[(start - 1) * 2:(end - 1) * 2].decode('utf-16-le')
+
+
+def test_astral_text_is_indexed_in_utf16_code_units():
+    document = RichTextDocument([
+        RichText(None, f'𝔄 {wrap_text_in_style("𝔦t", "italic")} x', {'heading1'}),
+        RichText(None, f'é {wrap_text_in_style("b", "bold")}', set())
+    ])
+    requests: list[dict] = build_requests(get_runs(document))
+    text: str = requests[0]['insertText']['text']
+
+    # the setup styles cover the whole text, 𝔄 and 𝔦 counting twice each
+    assert styled_ranges(requests, 'updateTextStyle') == [(1, 14), (4, 7), (12, 14)]
+    assert styled_ranges(requests, 'updateParagraphStyle') == [(1, 14), (1, 10)]
+
+    assert utf16_slice(text, 4, 7) == '𝔦t'
+    assert utf16_slice(text, 12, 14) == 'b\n'
+    assert utf16_slice(text, 1, 10) == '𝔄 𝔦t x\n'
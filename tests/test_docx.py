@@ -0,0 +1,24 @@
+import pytest
+from output.docx import to_docx_stream
+from pipeline.pipe import get_sender
+from richtext import RichText, RichTextDocument
+
+
+def test_docx_writers_cannot_share_an_export():
+    with pytest.raises(ValueError):
+        get_sender(['docx', 'docx stream'])
+
+
+def test_failed_stream_leaves_no_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'export').mkdir()
+    (tmp_path / 'export' / 'title.docx').write_bytes(b'earlier export')
+
+    # a control character has no place in XML, so the stream fails part way
+    document = RichTextDocument([RichText(None, 'fine', set()), RichText(None, 'bad \x01', set())])
+
+    with pytest.raises(ValueError):
+        to_docx_stream(document, {'title': 'title', 'publication': '', 'date': ''})
+
+    assert sorted(path.name for path in (tmp_path / 'export').iterdir()) == ['title.docx']
+    assert (tmp_path / 'export' / 'title.docx').read_bytes() == b'earlier export'
@@ -0,0 +1,29 @@
+from pathlib import Path
+import pytest
+from input.get import adaptor, get_body_generic
+from input.parser import get_parsers, parse_html
+from normalise import (clean, invert_quotations, normalisation_pipeline, remove_empty, split_on_newlines,
+                       strip_whitespace, swap_italics_for_bold)
+from richtext import RichTextDocument
+
+FIXTURES: list[Path] = sorted((Path(__file__).parent / 'fixtures' / 'html').glob('*.html'))
+
+# the pipeline the Normaliser replaced, one pass over the document per step
+STEPS: list = [strip_whitespace, remove_empty, clean, swap_italics_for_bold, invert_quotations, split_on_newlines]
+
+
+def normalised(content: bytes, parser: str, steps: list) -> list[tuple[str, list[str]]]:
+    document: RichTextDocument = adaptor(get_body_generic(parse_html(content, parser)))
+
+    for step in steps:
+        step(document)
+
+    return [(rt.text, sorted(rt.paragraph_styles)) for rt in document.texts]
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=lambda path: path.stem)
+@pytest.mark.parametrize('parser', list(get_parsers()))
+def test_normaliser_matches_the_step_pipeline(path: Path, parser: str):
+    content: bytes = path.read_bytes()
+
+    assert normalised(content, parser, normalisation_pipeline()) == normalised(content, parser, STEPS)
@@ -0,0 +1,63 @@
+import styles
+from input.parsed import document_key, function_identity
+
+
+def compile_function(source: str, name: str = 'step', **namespace):
+    """
+    Functions made by exec have no source file, so they are identified by their compiled code.
+    """
+
+    exec(source, namespace)
+    return namespace[name]
+
+
+def test_source_changes_identity():
+    first = compile_function('def step(document):\n    return "a"\n')
+    second = compile_function('def step(document):\n    return "b"\n')
+
+    assert function_identity(first) != function_identity(second)
+
+
+def test_nested_function_changes_identity():
+    first = compile_function('def step(document):\n    def inner():\n        return 1\n    return inner()\n')
+    second = compile_function('def step(document):\n    def inner():\n        return 2\n    return inner()\n')
+
+    assert function_identity(first) != function_identity(second)
+
+
+def test_defaults_change_identity():
+    first = compile_function('def step(document, limit=1):\n    return limit\n')
+    second = compile_function('def step(document, limit=2):\n    return limit\n')
+
+    assert function_identity(first) != function_identity(second)
+
+
+def test_closure_changes_identity():
+    def make_step(limit: int):
+        def step(document):
+            return limit
+
+        return step
+
+    assert function_identity(make_step(1)) != function_identity(make_step(2))
+    assert function_identity(make_step(1)) == function_identity(make_step(1))
+
+
+def test_globals_change_identity():
+    source = 'def step(document):\n    return LIMIT\n'
+
+    assert function_identity(compile_function(source, LIMIT=1)) != function_identity(compile_function(source, LIMIT=2))
+
+
+def test_recursion_terminates():
+    step = compile_function('def step(document):\n    return step(document)\n')
+
+    assert function_identity(step) == function_identity(step)
+
+
+def test_registering_a_style_changes_document_key(isolated_styles):
+    before: str = document_key(b'<u>x</u>', {}, [])
+
+    styles.register_text_style(styles.TextStyle('underline', ('u',)))
+
+    assert document_key(b'<u>x</u>', {}, []) != before
@@ -0,0 +1,30 @@
+from pathlib import Path
+import pytest
+from input.get import adaptor, get_body_generic
+from input.parser import get_parsers, parse_html
+from input.stream import iter_rich_text
+
+FIXTURES: list[Path] = sorted((Path(__file__).parent / 'fixtures' / 'html').glob('*.html'))
+
+
+def build(content: bytes, parser: str) -> list[tuple[str, list[str]]]:
+    document = adaptor(get_body_generic(parse_html(content, parser)))
+
+    return [(rt.text, sorted(rt.paragraph_styles)) for rt in document.texts]
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=lambda path: path.stem)
+@pytest.mark.parametrize('parser', [parser for parser in get_parsers() if parser != 'html.parser'])
+def test_parsers_build_the_same_document(path: Path, parser: str):
+    content: bytes = path.read_bytes()
+
+    assert build(content, parser) == build(content, 'html.parser')
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=lambda path: path.stem)
+@pytest.mark.parametrize('size', [1, 64, 1 << 20])
+def test_streaming_builds_the_same_document(path: Path, size: int):
+    content: bytes = path.read_bytes()
+    chunks = (content[i:i + size] for i in range(0, len(content), size))
+
+    assert [(rt.text, sorted(rt.paragraph_styles)) for rt in iter_rich_text(chunks)] == build(content, 'html.parser')
@@ -0,0 +1,55 @@
+import pytest
+import input.cache
+from input.cache import Cache
+from pipeline import pipeline
+from spellcheck import Mistake, write_review
+
+SOURCE: str = 'https://example.com/land'
+CONTENT: bytes = b'<html><body><p>The tenents met.</p><p>They asked for a fair rent.</p></body></html>'
+
+
+def title(content, metadata: dict[str, str]) -> None:
+    metadata['title'] = 'land'
+
+
+PLUGINS: dict = {'metadata': [title]}
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(input.cache, '_cache', Cache(str(tmp_path / '.cache')))
+
+    (tmp_path / 'export').mkdir()
+
+    return tmp_path / 'export'
+
+
+def test_review_is_applied_before_export(export, monkeypatch):
+    write_review(export / 'land.spellcheck.json',
+                 [Mistake(4, 7, 'tenents', 'Possible spelling mistake', ['tenants', 'tenets'])])
+    monkeypatch.setattr('builtins.input', lambda prompt: '1')
+
+    pipeline(SOURCE, PLUGINS, output='txt', content=CONTENT, review=True)
+
+    assert (export / 'land.txt').read_text() == 'The tenants met.\nThey asked for a fair rent.'
+
+
+def test_review_leaves_cached_document_as_checked(export, monkeypatch):
+    write_review(export / 'land.spellcheck.json',
+                 [Mistake(4, 7, 'tenents', 'Possible spelling mistake', ['tenants', 'tenets'])])
+    monkeypatch.setattr('builtins.input', lambda prompt: '1')
+
+    pipeline(SOURCE, PLUGINS, output=[], content=CONTENT)
+    pipeline(SOURCE, PLUGINS, output=[], content=CONTENT, review=export / 'land.spellcheck.json')
+    pipeline(SOURCE, PLUGINS, output='txt', content=CONTENT)
+
+    # the review's offsets stay valid for the next time it is gone through
+    assert (export / 'land.txt').read_text() == 'The tenents met.\nThey asked for a fair rent.'
+
+
+def test_no_output_exports_nothing(export):
+    result = pipeline(SOURCE, PLUGINS, output=[], content=CONTENT)
+
+    assert result.exports == []
+    assert list(export.iterdir()) == []
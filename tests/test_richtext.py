@@ -0,0 +1,76 @@
+from anchors import wrap_text_in_style
+from richtext import RichText, RichTextDocument
+
+
+def make_document() -> RichTextDocument:
+    return RichTextDocument([
+        RichText(None, 'a', {'heading1'}),
+        RichText(None, wrap_text_in_style('b', 'italic'), set()),
+        RichText(None, 'c', {'heading1'})
+    ])
+
+
+def texts(found: list[RichText]) -> list[str]:
+    return [rt.plain_text for rt in found]
+
+
+def test_index_follows_list_mutation():
+    document = make_document()
+    assert texts(document.get(paragraph_style='heading1')) == ['a', 'c']
+
+    document.texts.remove(document.texts[0])
+    assert texts(document.get(paragraph_style='heading1')) == ['c']
+
+    document.texts.insert(0, RichText(None, 'd', {'heading1'}))
+    assert texts(document.get(paragraph_style='heading1')) == ['d', 'c']
+
+    document.texts.append(RichText(None, wrap_text_in_style('e', 'italic'), set()))
+    assert texts(document.get(text_style='italic')) == ['b', 'e']
+
+    del document.texts[1:]
+    assert texts(document.get(paragraph_style='heading1')) == ['d']
+    assert document.get(text_style='italic') == []
+
+    document.texts[0] = RichText(None, 'f', {'blockquote'})
+    assert texts(document.get(paragraph_style='blockquote')) == ['f']
+    assert document.texts[0].document is document
+
+
+def test_index_follows_paragraph_style_change():
+    document = make_document()
+    assert document.get(paragraph_style='blockquote') == []
+
+    rt: RichText = document.texts[1]
+    rt.paragraph_styles = rt.paragraph_styles | {'blockquote'}
+    assert texts(document.get(paragraph_style='blockquote')) == ['b']
+
+
+def test_index_follows_paragraph_styles_edited_in_place():
+    document = make_document()
+    assert document.get(paragraph_style='align-right') == []
+
+    document.texts[1].paragraph_styles.add('align-right')
+    assert texts(document.get(paragraph_style='align-right')) == ['b']
+
+    document.texts[0].paragraph_styles.remove('heading1')
+    assert texts(document.get(paragraph_style='heading1')) == ['c']
+
+    document.texts[2].paragraph_styles |= {'align-right'}
+    assert texts(document.get(paragraph_style='align-right')) == ['b', 'c']
+
+    document.texts[1].paragraph_styles.discard('align-right')
+    assert texts(document.get(paragraph_style='align-right')) == ['c']
+
+
+def test_snapshot_shares_no_texts_or_sources():
+    document = RichTextDocument([RichText(object(), 'a', {'heading1'})])
+    snapshot = document.snapshot()
+
+    assert texts(snapshot.texts) == ['a'] and snapshot.texts[0].paragraph_styles == {'heading1'}
+    assert snapshot.texts[0] is not document.texts[0] and snapshot.texts[0].src is None
+
+    snapshot.texts[0].paragraph_styles.add('blockquote')
+    assert document.texts[0].paragraph_styles == {'heading1'}
+
+    snapshot.texts[0].text = 'b'
+    assert document.texts[0].text == 'a'
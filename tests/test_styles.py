@@ -0,0 +1,29 @@
+import pytest
+import anchors
+from richtext import RichText, RichTextDocument
+from output.wordpress.build import build_html_from_document
+from styles import docs_text_style, docx_font_attributes, idml_attributes
+
+
+def test_style_without_text_style_is_skipped(isolated_styles):
+    anchors.register_style('anchors-only')
+    styles = frozenset({'italic', 'anchors-only'})
+
+    assert docs_text_style(styles) == {'italic': True}
+    assert docx_font_attributes(styles) == {'italic': True}
+    assert idml_attributes(styles) == {'FontStyle': 'Italic'}
+
+
+def test_wordpress_drops_anchors_without_text_style(isolated_styles):
+    start, end = anchors.register_style('anchors-only')
+    italic: str = anchors.wrap_text_in_style('b', 'italic')
+    document = RichTextDocument([RichText(None, f'a{start}{italic}{end}c', set())])
+
+    assert str(build_html_from_document(document)) == '<!-- wp:paragraph --><p>a<em>b</em>c</p><!-- /wp:paragraph -->'
+
+
+def test_wordpress_rejects_unregistered_private_use_characters():
+    document = RichTextDocument([RichText(None, 'a\uf8ffb', set())])
+
+    with pytest.raises(ValueError):
+        build_html_from_document(document)
@@ -0,0 +1,117 @@
+from pathlib import Path
+import pytest
+from anchors import get_style_anchors
+from input.get import adaptor, get_body_generic
+from input.parser import parse_html
+from normalise import normalisation_pipeline
+from output.wordpress.build import build_html_from_document
+from output.wordpress.client import WordPressClient, WordPressConfig
+from richtext import RichText, RichTextDocument
+
+
+class Response:
+    def __init__(self, body) -> None:
+        self.body = body
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return self.body
+
+
+class Session:
+    """
+    Stands in for the WordPress REST API, with posts looked up by slug.
+    """
+
+    def __init__(self, posts: dict[str, int]) -> None:
+        self.posts: dict[str, int] = posts
+        self.sent: list[tuple[str, dict]] = []
+
+    def get(self, url: str, params: dict, timeout: float) -> Response:
+        slug: str = params['slug']
+        return Response([{'id': self.posts[slug]}] if slug in self.posts else [])
+
+    def post(self, url: str, json: dict, timeout: float) -> Response:
+        self.sent.append((url, json))
+        return Response(json)
+
+
+def make_client(posts: dict[str, int]) -> tuple[WordPressClient, Session]:
+    client = WordPressClient(WordPressConfig('https://example.com/wp-json/wp/v2/posts', 'name', 'password'))
+    client.session = Session(posts)
+
+    return client, client.session
+
+
+POST: dict = {'title': 'Title', 'slug': 'title', 'content': '', 'status': 'draft', 'author': 6}
+
+
+def test_new_post_is_created_as_draft():
+    client, session = make_client({})
+    client.publish(POST)
+
+    assert session.sent == [('https://example.com/wp-json/wp/v2/posts', POST)]
+
+
+def test_update_keeps_status_and_author():
+    client, session = make_client({'title': 12})
+    client.publish(POST)
+
+    url, data = session.sent[0]
+    assert url == 'https://example.com/wp-json/wp/v2/posts/12'
+    assert data == {'title': 'Title', 'slug': 'title', 'content': ''}
+
+
+FIXTURES: list[Path] = sorted((Path(__file__).parent / 'fixtures' / 'html').glob('*.html'))
+
+I, I_END = get_style_anchors('italic')
+B, B_END = get_style_anchors('bold')
+
+
+def build(text: str) -> str:
+    html: str = str(build_html_from_document(RichTextDocument([RichText(None, text, set())])))
+
+    return html.removeprefix('<!-- wp:paragraph --><p>').removesuffix('</p><!-- /wp:paragraph -->')
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=lambda path: path.stem)
+def test_fixture_blocks(path: Path):
+    """
+    The expected blocks are what the BeautifulSoup builder wrote, except in unicode.html, whose "<tag>" text
+    it read as a tag.
+    """
+
+    document: RichTextDocument = adaptor(get_body_generic(parse_html(path.read_bytes())))
+
+    for step in normalisation_pipeline():
+        step(document)
+
+    expected: str = (path.parent.parent / 'wordpress' / path.name).read_text(encoding='utf-8')
+
+    assert str(build_html_from_document(document)) + '\n' == expected
+
+
+@pytest.mark.parametrize('text, html', [
+    # a tag closed out of order closes the tags opened inside it, and an unmatched close is dropped
+    (f'{I}a{B}b{I_END}c{B_END}d', '<em>a<strong>b</strong></em>cd'),
+    (f'x{B_END}y', 'xy'),
+    (f'{I}open', '<em>open</em>'),
+    # whitespace-only strings collapse, as BeautifulSoup's did
+    (f'{I}  {I_END}', '<em> </em>'),
+    ('a > b', 'a &gt; b'),
+    ('AT&T & co', 'AT&amp;T &amp; co'),
+    ('1 < 2', '1 &lt; 2')
+])
+def test_text_is_written_as_before(text: str, html: str):
+    assert build(text) == html
+
+
+@pytest.mark.parametrize('text, html', [
+    # the BeautifulSoup builder read these as markup: x <y z="">w</y> and a &amp; b
+    ('x <y z>w', 'x &lt;y z&gt;w'),
+    ('a &amp b', 'a &amp;amp b')
+])
+def test_markup_like_text_is_escaped(text: str, html: str):
+    assert build(text) == html